@@ -1,4 +1,143 @@
+use arrow_array::cast::AsArray;
+use arrow_array::types::{Float64Type, UInt64Type};
+use arrow_array::{ArrayRef, Float64Array, RecordBatch, UInt64Array};
+use arrow_ipc::writer::FileWriter;
+use arrow_schema::{DataType, Field, Schema};
+use parquet::arrow::ArrowWriter;
+use parquet::basic::Compression;
+use parquet::file::properties::WriterProperties;
+use pyo3::buffer::PyBuffer;
+use pyo3::exceptions::{PyIOError, PyValueError};
 use pyo3::prelude::*;
+use statrs::distribution::{ChiSquared, ContinuousCDF, Exp, LogNormal, Normal};
+use std::alloc::{GlobalAlloc, Layout, System};
+use std::cell::Cell;
+use std::fs::File;
+use std::io::{BufWriter, Write};
+use std::path::Path;
+use std::sync::atomic::{AtomicUsize, Ordering};
+use std::sync::{Arc, OnceLock};
+use std::time::Instant;
+
+// System allocator that counts allocations per thread for the opt-in profiler.
+// Counting only happens while an enabled Profiler exists, otherwise every
+// allocation costs one relaxed atomic load.
+struct CountingAllocator;
+
+static ACTIVE_PROFILERS: AtomicUsize = AtomicUsize::new(0);
+
+thread_local! {
+    static ALLOCATIONS: Cell<u64> = const { Cell::new(0) };
+    static ALLOCATED_BYTES: Cell<u64> = const { Cell::new(0) };
+}
+
+fn record_allocation(size: usize) {
+    if ACTIVE_PROFILERS.load(Ordering::Relaxed) == 0 {
+        return;
+    }
+    let _ = ALLOCATIONS.try_with(|c| c.set(c.get() + 1));
+    let _ = ALLOCATED_BYTES.try_with(|c| c.set(c.get() + size as u64));
+}
+
+unsafe impl GlobalAlloc for CountingAllocator {
+    unsafe fn alloc(&self, layout: Layout) -> *mut u8 {
+        record_allocation(layout.size());
+        System.alloc(layout)
+    }
+
+    unsafe fn alloc_zeroed(&self, layout: Layout) -> *mut u8 {
+        record_allocation(layout.size());
+        System.alloc_zeroed(layout)
+    }
+
+    unsafe fn realloc(&self, ptr: *mut u8, layout: Layout, new_size: usize) -> *mut u8 {
+        record_allocation(new_size);
+        System.realloc(ptr, layout, new_size)
+    }
+
+    unsafe fn dealloc(&self, ptr: *mut u8, layout: Layout) {
+        System.dealloc(ptr, layout)
+    }
+}
+
+#[global_allocator]
+static GLOBAL: CountingAllocator = CountingAllocator;
+
+// Per-phase wall time, allocation count and allocated bytes; a no-op unless enabled
+struct Profiler {
+    enabled: bool,
+    started: Option<(Instant, u64, u64)>,
+    timings: Vec<(String, f64, u64, u64)>,
+}
+
+impl Profiler {
+    fn new(enabled: bool) -> Self {
+        if enabled {
+            ACTIVE_PROFILERS.fetch_add(1, Ordering::Relaxed);
+        }
+        Profiler {
+            enabled,
+            started: if enabled { Some(Self::snapshot()) } else { None },
+            timings: Vec::new(),
+        }
+    }
+
+    fn disabled() -> Self {
+        Self::new(false)
+    }
+
+    fn snapshot() -> (Instant, u64, u64) {
+        let allocations = ALLOCATIONS.try_with(|c| c.get()).unwrap_or(0);
+        let allocated_bytes = ALLOCATED_BYTES.try_with(|c| c.get()).unwrap_or(0);
+        (Instant::now(), allocations, allocated_bytes)
+    }
+
+    // Closes the phase that started at the previous call
+    fn phase(&mut self, name: &str) {
+        if let Some((start, allocations, allocated_bytes)) = self.started {
+            let (now, allocations_now, allocated_bytes_now) = Self::snapshot();
+            self.timings.push((
+                name.to_string(),
+                (now - start).as_secs_f64(),
+                allocations_now - allocations,
+                allocated_bytes_now - allocated_bytes,
+            ));
+            // Restart after the push so the profiler's own allocation is not charged
+            self.started = Some(Self::snapshot());
+        }
+    }
+
+    fn finish(mut self) -> Vec<(String, f64, u64, u64)> {
+        std::mem::take(&mut self.timings)
+    }
+}
+
+impl Drop for Profiler {
+    fn drop(&mut self) {
+        if self.enabled {
+            ACTIVE_PROFILERS.fetch_sub(1, Ordering::Relaxed);
+        }
+    }
+}
+
+// Sample size behind the number of intervals. Integer weights count repeated
+// observations, so the expanded size is used; fractional weights are relative
+// and use Kish's effective size (Σw)² / Σw², which does not depend on their scale.
+fn effective_sample_size(n: usize, weights: Option<&[f64]>) -> usize {
+    let Some(weights) = weights else {
+        return n;
+    };
+    let total: f64 = weights.iter().sum();
+    if weights.iter().all(|w| w.fract() == 0.0) {
+        return total.round() as usize;
+    }
+    let sum_squares: f64 = weights.iter().map(|w| w * w).sum();
+    if sum_squares > 0.0 {
+        (total * total / sum_squares).round() as usize
+    } else {
+        0
+    }
+}
 
 fn sturges(n: usize) -> usize {
     if n <= 1 {
@@ -7,19 +146,169 @@ fn sturges(n: usize) -> usize {
     (1.0 + 3.322 * (n as f64).log10()).round() as usize
 }
 
-fn compute_intervals(data: &[f64]) -> Vec<(f64, f64)> {
-    if data.is_empty() {
-        return Vec::new();
+// Vectorized kernels: AVX2 when the CPU supports it, otherwise chunked code
+// with independent per-lane accumulators. RUST_STATS_SIMD=off forces the
+// scalar path, benchmark.py uses it to measure the speedup.
+const SIMD_LANES: usize = 4;
+const BIN_BLOCK: usize = 512;
+
+fn avx2_enabled() -> bool {
+    static ENABLED: OnceLock<bool> = OnceLock::new();
+    *ENABLED.get_or_init(|| {
+        let forced_off = std::env::var("RUST_STATS_SIMD").is_ok_and(|v| v.eq_ignore_ascii_case("off"));
+        #[cfg(target_arch = "x86_64")]
+        {
+            !forced_off && std::arch::is_x86_feature_detected!("avx2")
+        }
+        #[cfg(not(target_arch = "x86_64"))]
+        {
+            let _ = forced_off;
+            false
+        }
+    })
+}
+
+fn min_max(data: &[f64]) -> (f64, f64) {
+    min_max_using(data, avx2_enabled())
+}
+
+// use_avx2 must only be true when the CPU supports AVX2
+fn min_max_using(data: &[f64], use_avx2: bool) -> (f64, f64) {
+    #[cfg(target_arch = "x86_64")]
+    if use_avx2 {
+        return unsafe { min_max_avx2(data) };
+    }
+    let _ = use_avx2;
+    min_max_scalar(data)
+}
+
+fn min_max_scalar(data: &[f64]) -> (f64, f64) {
+    let mut mins = [f64::INFINITY; SIMD_LANES];
+    let mut maxs = [f64::NEG_INFINITY; SIMD_LANES];
+
+    let mut chunks = data.chunks_exact(SIMD_LANES);
+    for chunk in &mut chunks {
+        for lane in 0..SIMD_LANES {
+            mins[lane] = mins[lane].min(chunk[lane]);
+            maxs[lane] = maxs[lane].max(chunk[lane]);
+        }
+    }
+    for &x in chunks.remainder() {
+        mins[0] = mins[0].min(x);
+        maxs[0] = maxs[0].max(x);
+    }
+    (
+        mins.iter().fold(f64::INFINITY, |acc, &x| acc.min(x)),
+        maxs.iter().fold(f64::NEG_INFINITY, |acc, &x| acc.max(x)),
+    )
+}
+
+#[cfg(target_arch = "x86_64")]
+#[target_feature(enable = "avx2")]
+unsafe fn min_max_avx2(data: &[f64]) -> (f64, f64) {
+    use std::arch::x86_64::*;
+
+    // Two accumulators per bound hide the latency of vminpd/vmaxpd. The data
+    // goes in the first operand: for NaN the second one is returned, so NaN
+    // values are skipped the same way f64::min skips them.
+    let mut min_a = _mm256_set1_pd(f64::INFINITY);
+    let mut min_b = min_a;
+    let mut max_a = _mm256_set1_pd(f64::NEG_INFINITY);
+    let mut max_b = max_a;
+
+    let mut chunks = data.chunks_exact(2 * SIMD_LANES);
+    for chunk in &mut chunks {
+        let a = _mm256_loadu_pd(chunk.as_ptr());
+        let b = _mm256_loadu_pd(chunk.as_ptr().add(SIMD_LANES));
+        min_a = _mm256_min_pd(a, min_a);
+        min_b = _mm256_min_pd(b, min_b);
+        max_a = _mm256_max_pd(a, max_a);
+        max_b = _mm256_max_pd(b, max_b);
     }
-    
-    let min_val = data.iter().fold(f64::INFINITY, |acc, &x| acc.min(x));
-    let max_val = data.iter().fold(f64::NEG_INFINITY, |acc, &x| acc.max(x));
 
-    if min_val == max_val {
+    let mut mins = [0.0; SIMD_LANES];
+    let mut maxs = [0.0; SIMD_LANES];
+    _mm256_storeu_pd(mins.as_mut_ptr(), _mm256_min_pd(min_a, min_b));
+    _mm256_storeu_pd(maxs.as_mut_ptr(), _mm256_max_pd(max_a, max_b));
+
+    let (tail_min, tail_max) = min_max_scalar(chunks.remainder());
+    (
+        mins.iter().fold(tail_min, |acc, &x| acc.min(x)),
+        maxs.iter().fold(tail_max, |acc, &x| acc.max(x)),
+    )
+}
+
+// First guess of the interval of each value, refine_bin settles it against
+// the interval bounds. NaN and out-of-range values get some estimate in
+// [0, last] and are rejected by refine_bin.
+fn bin_estimates(values: &[f64], min_val: f64, inv_width: f64, last: usize, out: &mut [u32], use_avx2: bool) {
+    #[cfg(target_arch = "x86_64")]
+    if use_avx2 {
+        unsafe { bin_estimates_avx2(values, min_val, inv_width, last, out) };
+        return;
+    }
+    let _ = use_avx2;
+    bin_estimates_scalar(values, min_val, inv_width, last, out);
+}
+
+fn bin_estimates_scalar(values: &[f64], min_val: f64, inv_width: f64, last: usize, out: &mut [u32]) {
+    for (estimate, &value) in out.iter_mut().zip(values) {
+        *estimate = (((value - min_val) * inv_width) as usize).min(last) as u32;
+    }
+}
+
+#[cfg(target_arch = "x86_64")]
+#[target_feature(enable = "avx2")]
+unsafe fn bin_estimates_avx2(values: &[f64], min_val: f64, inv_width: f64, last: usize, out: &mut [u32]) {
+    use std::arch::x86_64::*;
+
+    let min_v = _mm256_set1_pd(min_val);
+    let inv_v = _mm256_set1_pd(inv_width);
+    let zero = _mm_setzero_si128();
+    let last_v = _mm_set1_epi32(last as i32);
+
+    let mut chunks = values.chunks_exact(SIMD_LANES);
+    let mut out_chunks = out.chunks_exact_mut(SIMD_LANES);
+    for (chunk, estimates) in (&mut chunks).zip(&mut out_chunks) {
+        let scaled = _mm256_mul_pd(_mm256_sub_pd(_mm256_loadu_pd(chunk.as_ptr()), min_v), inv_v);
+        // NaN and values outside the i32 range convert to i32::MIN and clamp to 0
+        let index = _mm256_cvttpd_epi32(scaled);
+        let index = _mm_min_epi32(_mm_max_epi32(index, zero), last_v);
+        _mm_storeu_si128(estimates.as_mut_ptr() as *mut __m128i, index);
+    }
+    bin_estimates_scalar(chunks.remainder(), min_val, inv_width, last, out_chunks.into_remainder());
+}
+
+fn value_range(data: &[f64], weights: Option<&[f64]>) -> Option<(f64, f64)> {
+    let (min_val, max_val) = match weights {
+        None => min_max(data),
+        Some(w) => {
+            let mut min_val = f64::INFINITY;
+            let mut max_val = f64::NEG_INFINITY;
+            for (&x, &weight) in data.iter().zip(w) {
+                // Values with zero weight do not exist in the expanded sample
+                if weight <= 0.0 {
+                    continue;
+                }
+                min_val = min_val.min(x);
+                max_val = max_val.max(x);
+            }
+            (min_val, max_val)
+        }
+    };
+
+    if min_val > max_val {
+        None
+    } else {
+        Some((min_val, max_val))
+    }
+}
+
+fn compute_intervals(min_val: f64, max_val: f64, k: usize) -> Vec<(f64, f64)> {
+    if min_val == max_val || k <= 1 {
         return vec![(min_val, max_val)];
     }
 
-    let k = sturges(data.len());
     let group_width = (max_val - min_val) / k as f64;
 
     let mut intervals = Vec::with_capacity(k);
@@ -37,36 +326,101 @@ fn compute_intervals(data: &[f64]) -> Vec<(f64, f64)> {
     intervals
 }
 
-fn count_frequencies(data: &[f64], intervals: &[(f64, f64)]) -> Vec<usize> {
+fn bin_index(value: f64, intervals: &[(f64, f64)]) -> Option<usize> {
+    let k = intervals.len();
+    if k == 0 {
+        return None;
+    }
+    let min_val = intervals[0].0;
+    let max_val = intervals[k - 1].1;
+
+    if !(value >= min_val && value <= max_val) {
+        return None;
+    }
+
+    let width = (max_val - min_val) / k as f64;
+    let estimate = if width > 0.0 {
+        (((value - min_val) / width) as usize).min(k - 1)
+    } else {
+        0
+    };
+    refine_bin(value, estimate, intervals)
+}
+
+fn refine_bin(value: f64, estimate: usize, intervals: &[(f64, f64)]) -> Option<usize> {
+    let k = intervals.len();
+    if !(value >= intervals[0].0 && value <= intervals[k - 1].1) {
+        return None;
+    }
+
+    // Rounding can put the estimate one interval off, the bounds decide
+    let mut i = estimate;
+    while i > 0 && value < intervals[i].0 {
+        i -= 1;
+    }
+    while i < k - 1 && value >= intervals[i].1 {
+        i += 1;
+    }
+    Some(i)
+}
+
+fn count_frequencies(data: &[f64], weights: Option<&[f64]>, intervals: &[(f64, f64)]) -> Vec<f64> {
+    count_frequencies_using(data, weights, intervals, avx2_enabled())
+}
+
+// use_avx2 must only be true when the CPU supports AVX2
+fn count_frequencies_using(data: &[f64], weights: Option<&[f64]>, intervals: &[(f64, f64)], use_avx2: bool) -> Vec<f64> {
     if intervals.is_empty() {
         return Vec::new();
     }
     
-    let mut freqs = vec![0; intervals.len()];
-    let last_index = intervals.len() - 1;
+    let mut freqs = vec![0.0; intervals.len()];
 
-    for &value in data {
-        let mut assigned = false;
-        for (i, &(start, end)) in intervals.iter().enumerate() {
-            if (i != last_index && value >= start && value < end) ||
-               (i == last_index && value >= start && value <= end) {
-                freqs[i] += 1;
-                assigned = true;
-                break;
+    let last = intervals.len() - 1;
+    let min_val = intervals[0].0;
+    let width = (intervals[last].1 - min_val) / intervals.len() as f64;
+    let inv_width = if width > 0.0 { 1.0 / width } else { 0.0 };
+    let mut estimates = [0u32; BIN_BLOCK];
+
+    for (b, block) in data.chunks(BIN_BLOCK).enumerate() {
+        let estimates = &mut estimates[..block.len()];
+        bin_estimates(block, min_val, inv_width, last, estimates, use_avx2);
+        let block_weights = weights.map(|w| &w[b * BIN_BLOCK..b * BIN_BLOCK + block.len()]);
+
+        for (j, (&value, &estimate)) in block.iter().zip(estimates.iter()).enumerate() {
+            let weight = block_weights.map_or(1.0, |w| w[j]);
+            if weight == 0.0 {
+                continue;
             }
-        }
-        if !assigned {
-            for (i, &(start, end)) in intervals.iter().enumerate() {
-                if value >= start && value <= end {
-                    freqs[i] += 1;
-                    break;
-                }
+            if let Some(i) = refine_bin(value, estimate as usize, intervals) {
+                freqs[i] += weight;
             }
         }
     }
     freqs
 }
 
+// Bins several samples on one grid, chunks of all samples share the worker threads
+fn count_frequencies_parallel(samples: &[&[f64]], intervals: &[(f64, f64)], n_threads: usize) -> Vec<Vec<f64>> {
+    let total_len: usize = samples.iter().map(|s| s.len()).sum();
+    let chunk_size = total_len.div_ceil(n_threads.max(1)).max(1);
+
+    std::thread::scope(|scope| {
+        let handles: Vec<_> = samples.iter()
+            .enumerate()
+            .flat_map(|(i, sample)| sample.chunks(chunk_size).map(move |chunk| (i, chunk)))
+            .map(|(i, chunk)| (i, scope.spawn(move || count_frequencies(chunk, None, intervals))))
+            .collect();
+
+        let mut freqs = vec![vec![0.0; intervals.len()]; samples.len()];
+        for (i, handle) in handles {
+            let partial = handle.join().expect("frequency counting thread panicked");
+            freqs[i].iter_mut().zip(partial).for_each(|(f, p)| *f += p);
+        }
+        freqs
+    })
+}
+
 fn compute_xi(intervals: &[(f64, f64)]) -> Vec<f64> {
     intervals
         .iter()
@@ -74,28 +428,28 @@ fn compute_xi(intervals: &[(f64, f64)]) -> Vec<f64> {
         .collect()
 }
 
-fn compute_si(freqs: &[usize]) -> Vec<usize> {
+fn compute_si(freqs: &[f64]) -> Vec<f64> {
     freqs.iter()
-        .scan(0, |acc, &freq| {
+        .scan(0.0, |acc, &freq| {
             *acc += freq;
             Some(*acc)
         })
         .collect()
 }
 
-fn compute_xi_ni(xi: &[f64], ni: &[usize]) -> Vec<f64> {
+fn compute_xi_ni(xi: &[f64], ni: &[f64]) -> Vec<f64> {
     xi.iter()
         .zip(ni.iter())
-        .map(|(&x, &n)| x * n as f64)
+        .map(|(&x, &n)| x * n)
         .collect()
 }
 
-fn compute_mean(xi_ni: &[f64], total_n: usize) -> f64 {
-    if total_n == 0 {
+fn compute_mean(xi_ni: &[f64], total_n: f64) -> f64 {
+    if total_n == 0.0 {
         return 0.0;
     }
     let sum_xi_ni: f64 = xi_ni.iter().sum();
-    sum_xi_ni / total_n as f64
+    sum_xi_ni / total_n
 }
 
 fn compute_xi_minus_mean(xi: &[f64], mean: f64) -> Vec<f64> {
@@ -104,35 +458,39 @@ fn compute_xi_minus_mean(xi: &[f64], mean: f64) -> Vec<f64> {
         .collect()
 }
 
-fn compute_abs_xi_minus_mean_ni(xi_minus_mean: &[f64], ni: &[usize]) -> Vec<f64> {
-    xi_minus_mean.iter()
-        .zip(ni.iter())
-        .map(|(&diff, &n)| diff.abs() * n as f64)
-        .collect()
+// |xi - mean|·ni, (xi - mean)²·ni, (xi - mean)³·ni, (xi - mean)⁴·ni and their sums
+struct DeviationPowers {
+    abs: Vec<f64>,
+    squared: Vec<f64>,
+    cubed: Vec<f64>,
+    fourth: Vec<f64>,
+    sums: [f64; 4],
 }
 
-fn compute_squared_xi_minus_mean_ni(xi_minus_mean: &[f64], ni: &[usize]) -> Vec<f64> {
-    xi_minus_mean.iter()
-        .zip(ni.iter())
-        .map(|(&diff, &n)| diff.powi(2) * n as f64)
-        .collect()
-}
+// One pass for all four columns: powers are built by multiplication instead of
+// powi, and each sum keeps one accumulator per lane
+fn compute_deviation_powers(xi_minus_mean: &[f64], ni: &[f64]) -> DeviationPowers {
+    let k = xi_minus_mean.len();
+    let mut columns = [vec![0.0; k], vec![0.0; k], vec![0.0; k], vec![0.0; k]];
+    let mut lanes = [[0.0; SIMD_LANES]; 4];
 
-fn compute_cubed_xi_minus_mean_ni(xi_minus_mean: &[f64], ni: &[usize]) -> Vec<f64> {
-    xi_minus_mean.iter()
-        .zip(ni.iter())
-        .map(|(&diff, &n)| diff.powi(3) * n as f64)
-        .collect()
-}
+    for (c, (diffs, counts)) in xi_minus_mean.chunks(SIMD_LANES).zip(ni.chunks(SIMD_LANES)).enumerate() {
+        for (lane, (&diff, &n)) in diffs.iter().zip(counts).enumerate() {
+            let squared = diff * diff;
+            let powers = [diff.abs() * n, squared * n, squared * diff * n, squared * squared * n];
+            for p in 0..4 {
+                columns[p][c * SIMD_LANES + lane] = powers[p];
+                lanes[p][lane] += powers[p];
+            }
+        }
+    }
 
-fn compute_fourth_power_xi_minus_mean_ni(xi_minus_mean: &[f64], ni: &[usize]) -> Vec<f64> {
-    xi_minus_mean.iter()
-        .zip(ni.iter())
-        .map(|(&diff, &n)| diff.powi(4) * n as f64)
-        .collect()
+    let sums = lanes.map(|l| (l[0] + l[1]) + (l[2] + l[3]));
+    let [abs, squared, cubed, fourth] = columns;
+    DeviationPowers { abs, squared, cubed, fourth, sums }
 }
 
-fn sum_ni(ni: &[usize]) -> usize {
+fn sum_ni(ni: &[f64]) -> f64 {
     ni.iter().sum()
 }
 
@@ -140,38 +498,22 @@ fn sum_xi_ni(xi_ni: &[f64]) -> f64 {
     xi_ni.iter().sum()
 }
 
-fn sum_abs_xi_minus_mean_ni(abs_xi_minus_mean_ni: &[f64]) -> f64 {
-    abs_xi_minus_mean_ni.iter().sum()
-}
-
-fn sum_squared_xi_minus_mean_ni(squared_xi_minus_mean_ni: &[f64]) -> f64 {
-    squared_xi_minus_mean_ni.iter().sum()
-}
-
-fn sum_cubed_xi_minus_mean_ni(cubed_xi_minus_mean_ni: &[f64]) -> f64 {
-    cubed_xi_minus_mean_ni.iter().sum()
-}
-
-fn sum_fourth_power_xi_minus_mean_ni(fourth_power_xi_minus_mean_ni: &[f64]) -> f64 {
-    fourth_power_xi_minus_mean_ni.iter().sum()
-}
-
-fn compute_variance(sum_squared: f64, total_n: usize) -> f64 {
-    if total_n == 0 {
+fn compute_variance(sum_squared: f64, total_n: f64) -> f64 {
+    if total_n == 0.0 {
         return 0.0;
     }
-    sum_squared / total_n as f64
+    sum_squared / total_n
 }
 
 fn compute_std(variance: f64) -> f64 {
     variance.sqrt()
 }
 
-fn compute_mean_linear_deviation(sum_abs: f64, total_n: usize) -> f64 {
-    if total_n == 0 {
+fn compute_mean_linear_deviation(sum_abs: f64, total_n: f64) -> f64 {
+    if total_n == 0.0 {
         return 0.0;
     }
-    sum_abs / total_n as f64
+    sum_abs / total_n
 }
 
 fn compute_variation_coefficient(std: f64, mean: f64) -> f64 {
@@ -182,39 +524,39 @@ fn compute_variation_coefficient(std: f64, mean: f64) -> f64 {
     }
 }
 
-fn compute_asymmetry(sum_cubed: f64, total_n: usize, std: f64) -> f64 {
-    if total_n == 0 || std == 0.0 {
+fn compute_asymmetry(sum_cubed: f64, total_n: f64, std: f64) -> f64 {
+    if total_n == 0.0 || std == 0.0 {
         0.0
     } else {
-        sum_cubed / (total_n as f64 * std.powi(3))
+        sum_cubed / (total_n * std.powi(3))
     }
 }
 
-fn compute_excess(sum_fourth: f64, total_n: usize, variance: f64) -> f64 {
-    if total_n == 0 || variance == 0.0 {
+fn compute_excess(sum_fourth: f64, total_n: f64, variance: f64) -> f64 {
+    if total_n == 0.0 || variance == 0.0 {
         0.0
     } else {
-        sum_fourth / (total_n as f64 * variance.powi(2)) - 3.0
+        sum_fourth / (total_n * variance.powi(2)) - 3.0
     }
 }
 
-fn calculate_medians(intervals: &[(f64, f64)], ni: &[usize], si: &[usize]) -> Vec<f64> {
+fn calculate_medians(intervals: &[(f64, f64)], ni: &[f64], si: &[f64]) -> Vec<f64> {
     let mut medians = Vec::new();
-    let total_n: usize = ni.iter().sum();
+    let total_n: f64 = ni.iter().sum();
     
-    if total_n == 0 || intervals.is_empty() {
+    if total_n == 0.0 || intervals.is_empty() {
         return medians;
     }
     
     for i in 0..intervals.len() {
         let (lower, upper) = intervals[i];
-        let freq = ni[i] as f64;
+        let freq = ni[i];
         
-        let accum_before = if i == 0 { 0.0 } else { si[i-1] as f64 };
+        let accum_before = if i == 0 { 0.0 } else { si[i-1] };
         
         let median = if freq > 0.0 {
             let h = upper - lower;
-            lower + ((total_n as f64 / 2.0 - accum_before) / freq) * h
+            lower + ((total_n / 2.0 - accum_before) / freq) * h
         } else {
             (lower + upper) / 2.0
         };
@@ -225,7 +567,7 @@ fn calculate_medians(intervals: &[(f64, f64)], ni: &[usize], si: &[usize]) -> Ve
     medians
 }
 
-fn calculate_modes(intervals: &[(f64, f64)], ni: &[usize]) -> Vec<f64> {
+fn calculate_modes(intervals: &[(f64, f64)], ni: &[f64]) -> Vec<f64> {
     let mut modes = Vec::new();
     
     if intervals.is_empty() {
@@ -234,10 +576,10 @@ fn calculate_modes(intervals: &[(f64, f64)], ni: &[usize]) -> Vec<f64> {
     
     for i in 0..intervals.len() {
         let (lower, upper) = intervals[i];
-        let freq = ni[i] as f64;
+        let freq = ni[i];
         
-        let freq_prev = if i > 0 { ni[i-1] as f64 } else { 0.0 };
-        let freq_next = if i < ni.len()-1 { ni[i+1] as f64 } else { 0.0 };
+        let freq_prev = if i > 0 { ni[i-1] } else { 0.0 };
+        let freq_next = if i < ni.len()-1 { ni[i+1] } else { 0.0 };
         
         let delta1 = freq - freq_prev;
         let delta2 = freq - freq_next;
@@ -256,11 +598,12 @@ fn calculate_modes(intervals: &[(f64, f64)], ni: &[usize]) -> Vec<f64> {
 }
 
 #[pyclass]
+#[derive(Clone)]
 struct GroupStatsResult {
     intervals: Vec<(f64, f64)>,
-    ni: Vec<usize>,
+    ni: Vec<f64>,
     xi: Vec<f64>,
-    si: Vec<usize>,
+    si: Vec<f64>,
     xi_ni: Vec<f64>,
     xi_minus_mean: Vec<f64>,
     abs_xi_minus_mean_ni: Vec<f64>,
@@ -284,6 +627,7 @@ struct GroupStatsResult {
     modes: Vec<f64>,
     midpoints: Vec<f64>,
     accumulated_frequencies: Vec<f64>,
+    timings: Vec<(String, f64, u64, u64)>,
 }
 
 #[pymethods]
@@ -294,7 +638,7 @@ impl GroupStatsResult {
     }
     
     #[getter]
-    fn ni(&self) -> Vec<usize> {
+    fn ni(&self) -> Vec<f64> {
         self.ni.clone()
     }
     
@@ -304,7 +648,7 @@ impl GroupStatsResult {
     }
     
     #[getter]
-    fn si(&self) -> Vec<usize> {
+    fn si(&self) -> Vec<f64> {
         self.si.clone()
     }
     
@@ -422,36 +766,104 @@ impl GroupStatsResult {
     fn accumulated_frequencies(&self) -> Vec<f64> {
         self.accumulated_frequencies.clone()
     }
+
+    /// `(phase, seconds, allocations, allocated_bytes)` per phase when
+    /// computed with `profile=True`, otherwise empty.
+    #[getter]
+    fn timings(&self) -> Vec<(String, f64, u64, u64)> {
+        self.timings.clone()
+    }
+
+    /// Goodness-of-fit tests on this result's intervals and frequencies.
+    #[pyo3(signature = (distribution="normal"))]
+    fn goodness_of_fit(&self, distribution: &str) -> PyResult<GoodnessOfFitResult> {
+        compute_goodness_of_fit(&self.intervals, &self.ni, distribution, None)
+    }
+
+    /// Writes the `"intervals"` table (one row per interval) or the
+    /// `"summary"` table (one row of sums and statistics) to `path`.
+    ///
+    /// `format` is `"csv"`, `"arrow"` (IPC file) or `"parquet"`; by default
+    /// it is taken from the file extension.
+    #[pyo3(signature = (path, format=None, table="intervals"))]
+    fn export(&self, py: Python<'_>, path: &str, format: Option<&str>, table: &str) -> PyResult<()> {
+        let format = ExportFormat::resolve(path, format)?;
+        let batch = group_stats_table(&[self], table, false)?;
+        py.detach(|| write_record_batch(&batch, path, format))
+    }
 }
 
-#[pyfunction]
-fn group_stats(data: Vec<f64>) -> PyResult<GroupStatsResult> {
-    let total_n = data.len();
+fn validate_weights(data: &[f64], weights: &[f64]) -> PyResult<()> {
+    if weights.len() != data.len() {
+        return Err(PyValueError::new_err(format!(
+            "weights length ({}) does not match data length ({})",
+            weights.len(),
+            data.len()
+        )));
+    }
+    if weights.iter().any(|&w| !w.is_finite() || w < 0.0) {
+        return Err(PyValueError::new_err("weights must be finite and non-negative"));
+    }
+    Ok(())
+}
+
+fn extract_buffer<T: pyo3::buffer::Element + Copy>(data: &Bound<'_, PyAny>) -> Option<PyResult<Vec<T>>> {
+    // Objects exporting a typed buffer (array.array, numpy, memoryview.cast)
+    // are copied without going through Python floats
+    PyBuffer::<T>::get(data).ok().map(|buffer| buffer.to_vec(data.py()))
+}
+
+fn extract_values(data: &Bound<'_, PyAny>) -> PyResult<Vec<f64>> {
+    match extract_buffer::<f64>(data) {
+        Some(values) => values,
+        None => data.extract(),
+    }
+}
+
+// Interval grid of a raw sample and its frequencies, shared by every
+// function that groups raw observations
+fn group_sample(data: &[f64], weights: Option<&[f64]>, profiler: &mut Profiler) -> (Vec<(f64, f64)>, Vec<f64>) {
+    let intervals = match value_range(data, weights) {
+        Some((min_val, max_val)) => compute_intervals(min_val, max_val, sturges(effective_sample_size(data.len(), weights))),
+        None => Vec::new(),
+    };
+    profiler.phase("compute_intervals");
+    let ni = count_frequencies(data, weights, &intervals);
+    profiler.phase("count_frequencies");
+    (intervals, ni)
+}
+
+fn compute_group_stats(data: &[f64], weights: Option<&[f64]>, profiler: &mut Profiler) -> GroupStatsResult {
+    let (intervals, ni) = group_sample(data, weights, profiler);
+    build_group_stats(intervals, ni, profiler)
+}
+
+fn build_group_stats(intervals: Vec<(f64, f64)>, ni: Vec<f64>, profiler: &mut Profiler) -> GroupStatsResult {
+    let total_n = sum_ni(&ni);
 
-    let intervals = compute_intervals(&data);
-    let ni = count_frequencies(&data, &intervals);
     let xi = compute_xi(&intervals);
     let si = compute_si(&ni);
     
-    let accumulated_frequencies: Vec<f64> = si.iter().map(|&x| x as f64).collect();
+    let accumulated_frequencies = si.clone();
     let medians = calculate_medians(&intervals, &ni, &si);
     let modes = calculate_modes(&intervals, &ni);
+    profiler.phase("medians_modes");
     
     let xi_ni = compute_xi_ni(&xi, &ni);
     let mean = compute_mean(&xi_ni, total_n);
     let xi_minus_mean = compute_xi_minus_mean(&xi, mean);
-    let abs_xi_minus_mean_ni = compute_abs_xi_minus_mean_ni(&xi_minus_mean, &ni);
-    let squared_xi_minus_mean_ni = compute_squared_xi_minus_mean_ni(&xi_minus_mean, &ni);
-    let cubed_xi_minus_mean_ni = compute_cubed_xi_minus_mean_ni(&xi_minus_mean, &ni);
-    let fourth_power_xi_minus_mean_ni = compute_fourth_power_xi_minus_mean_ni(&xi_minus_mean, &ni);
+    let DeviationPowers {
+        abs: abs_xi_minus_mean_ni,
+        squared: squared_xi_minus_mean_ni,
+        cubed: cubed_xi_minus_mean_ni,
+        fourth: fourth_power_xi_minus_mean_ni,
+        sums: [sum_abs_val, sum_squared_val, sum_cubed_val, sum_fourth_val],
+    } = compute_deviation_powers(&xi_minus_mean, &ni);
+    profiler.phase("moment_vectors");
     
     // Calculate sums
-    let sum_ni_val = sum_ni(&ni) as f64;
+    let sum_ni_val = total_n;
     let sum_xi_ni_val = sum_xi_ni(&xi_ni);
-    let sum_abs_val = sum_abs_xi_minus_mean_ni(&abs_xi_minus_mean_ni);
-    let sum_squared_val = sum_squared_xi_minus_mean_ni(&squared_xi_minus_mean_ni);
-    let sum_cubed_val = sum_cubed_xi_minus_mean_ni(&cubed_xi_minus_mean_ni);
-    let sum_fourth_val = sum_fourth_power_xi_minus_mean_ni(&fourth_power_xi_minus_mean_ni);
     
     // Calculate statistics
     let variance = compute_variance(sum_squared_val, total_n);
@@ -460,8 +872,9 @@ fn group_stats(data: Vec<f64>) -> PyResult<GroupStatsResult> {
     let variation_coef = compute_variation_coefficient(std, mean);
     let asymmetry = compute_asymmetry(sum_cubed_val, total_n, std);
     let excess = compute_excess(sum_fourth_val, total_n, variance);
+    profiler.phase("sums_and_statistics");
 
-    Ok(GroupStatsResult {
+    GroupStatsResult {
         intervals,
         ni,
         xi: xi.clone(),
@@ -489,12 +902,2375 @@ fn group_stats(data: Vec<f64>) -> PyResult<GroupStatsResult> {
         modes,
         midpoints: xi,
         accumulated_frequencies,
-    })
+        timings: Vec::new(),
+    }
 }
 
-#[pymodule]
-fn rust_stats(m: &Bound<'_, PyModule>) -> PyResult<()> {
-    m.add_class::<GroupStatsResult>()?;
-    m.add_function(wrap_pyfunction!(group_stats, m)?)?;
-    Ok(())
-}
\ No newline at end of file
+/// Grouped statistics of raw observations.
+///
+/// `weights` are optional frequency weights, one per observation: an
+/// observation with weight `w` counts as if it appeared `w` times.
+/// Fractional weights are treated as relative: the number of intervals
+/// comes from Kish's effective sample size instead of their sum.
+/// With `profile=True` the result carries per-phase `timings`.
+#[pyfunction]
+#[pyo3(signature = (data, weights=None, profile=false))]
+fn group_stats(
+    py: Python<'_>,
+    data: &Bound<'_, PyAny>,
+    weights: Option<&Bound<'_, PyAny>>,
+    profile: bool,
+) -> PyResult<GroupStatsResult> {
+    let mut profiler = Profiler::new(profile);
+    let data = extract_values(data)?;
+    let weights = weights.map(extract_values).transpose()?;
+    profiler.phase("list_conversion");
+    if let Some(w) = &weights {
+        validate_weights(&data, w)?;
+    }
+    let mut result = py.detach(|| compute_group_stats(&data, weights.as_deref(), &mut profiler));
+    result.timings = profiler.finish();
+    Ok(result)
+}
+
+/// Grouped statistics of pre-aggregated data given as `(value, count)` pairs.
+///
+/// Equivalent to calling `group_stats` on the expanded sample, without
+/// materialising it.
+#[pyfunction]
+#[pyo3(signature = (values, counts, profile=false))]
+fn group_stats_from_frequencies(
+    py: Python<'_>,
+    values: &Bound<'_, PyAny>,
+    counts: &Bound<'_, PyAny>,
+    profile: bool,
+) -> PyResult<GroupStatsResult> {
+    let mut profiler = Profiler::new(profile);
+    let values = extract_values(values)?;
+    let counts = extract_values(counts)?;
+    profiler.phase("list_conversion");
+    validate_weights(&values, &counts)?;
+    let mut result = py.detach(|| compute_group_stats(&values, Some(&counts), &mut profiler));
+    result.timings = profiler.finish();
+    Ok(result)
+}
+
+// Histogram over a fixed interval grid, updated as values enter and leave a window.
+// Power sums are kept over the interval index, so add/remove stays exact.
+struct RollingHistogram {
+    intervals: Vec<(f64, f64)>,
+    xi: Vec<f64>,
+    counts: Vec<u64>,
+    n: u64,
+    power_sums: [u128; 4],
+}
+
+impl RollingHistogram {
+    fn new(intervals: Vec<(f64, f64)>) -> Self {
+        let xi = compute_xi(&intervals);
+        let k = intervals.len();
+        RollingHistogram {
+            intervals,
+            xi,
+            counts: vec![0; k],
+            n: 0,
+            power_sums: [0; 4],
+        }
+    }
+
+    fn clear(&mut self) {
+        self.counts.iter_mut().for_each(|c| *c = 0);
+        self.n = 0;
+        self.power_sums = [0; 4];
+    }
+
+    fn add(&mut self, value: f64) {
+        if let Some(j) = bin_index(value, &self.intervals) {
+            self.counts[j] += 1;
+            self.n += 1;
+            let j = j as u128;
+            self.power_sums[0] += j;
+            self.power_sums[1] += j * j;
+            self.power_sums[2] += j * j * j;
+            self.power_sums[3] += j * j * j * j;
+        }
+    }
+
+    fn remove(&mut self, value: f64) {
+        if let Some(j) = bin_index(value, &self.intervals) {
+            self.counts[j] -= 1;
+            self.n -= 1;
+            let j = j as u128;
+            self.power_sums[0] -= j;
+            self.power_sums[1] -= j * j;
+            self.power_sums[2] -= j * j * j;
+            self.power_sums[3] -= j * j * j * j;
+        }
+    }
+
+    fn push_window(&self, out: &mut RollingStatsResult) {
+        let total_n = self.n as f64;
+        out.count.push(total_n);
+        out.histogram.extend(self.counts.iter().map(|&c| c as f64));
+
+        if self.n == 0 {
+            out.mean.push(0.0);
+            out.variance.push(0.0);
+            out.std.push(0.0);
+            out.mean_linear_dev.push(0.0);
+            out.variation_coef.push(0.0);
+            out.asymmetry.push(0.0);
+            out.excess.push(0.0);
+            return;
+        }
+
+        // Raw moments of the interval index j, then central moments by expansion
+        let k = self.intervals.len();
+        let min_val = self.intervals[0].0;
+        let width = (self.intervals[k - 1].1 - min_val) / k as f64;
+        let e1 = self.power_sums[0] as f64 / total_n;
+        let e2 = self.power_sums[1] as f64 / total_n;
+        let e3 = self.power_sums[2] as f64 / total_n;
+        let e4 = self.power_sums[3] as f64 / total_n;
+        let m2 = (e2 - e1 * e1).max(0.0);
+        let m3 = e3 - 3.0 * e1 * e2 + 2.0 * e1.powi(3);
+        let m4 = e4 - 4.0 * e1 * e3 + 6.0 * e1 * e1 * e2 - 3.0 * e1.powi(4);
+
+        // Midpoint of interval j is min + (j + 0.5) * width
+        let mean = min_val + (e1 + 0.5) * width;
+        let sum_squared = total_n * m2 * width.powi(2);
+        let sum_cubed = total_n * m3 * width.powi(3);
+        let sum_fourth = total_n * m4 * width.powi(4);
+        let sum_abs: f64 = self.xi.iter()
+            .zip(self.counts.iter())
+            .map(|(&x, &c)| (x - mean).abs() * c as f64)
+            .sum();
+
+        let variance = compute_variance(sum_squared, total_n);
+        let std = compute_std(variance);
+        out.mean.push(mean);
+        out.variance.push(variance);
+        out.std.push(std);
+        out.mean_linear_dev.push(compute_mean_linear_deviation(sum_abs, total_n));
+        out.variation_coef.push(compute_variation_coefficient(std, mean));
+        out.asymmetry.push(compute_asymmetry(sum_cubed, total_n, std));
+        out.excess.push(compute_excess(sum_fourth, total_n, variance));
+    }
+}
+
+fn count_windows(n: usize, window: usize, step: usize) -> Vec<(usize, usize)> {
+    if window > n {
+        return Vec::new();
+    }
+    (0..=n - window)
+        .step_by(step)
+        .map(|start| (start, start + window))
+        .collect()
+}
+
+fn time_windows(timestamps: &[f64], window: f64, step: Option<f64>) -> (Vec<(usize, usize)>, Vec<f64>) {
+    let n = timestamps.len();
+    if n == 0 {
+        return (Vec::new(), Vec::new());
+    }
+
+    // Window ending at `end` holds timestamps in (end - window, end]
+    let ends: Vec<f64> = match step {
+        None => (0..n)
+            .filter(|&i| i == n - 1 || timestamps[i + 1] != timestamps[i])
+            .map(|i| timestamps[i])
+            .collect(),
+        Some(step) => {
+            // The first window ends at timestamps[0], otherwise the exclusive
+            // lower bound would leave the first timestamp out of every window
+            let first = timestamps[0];
+            let last = timestamps[n - 1];
+            let mut ends = Vec::new();
+            let mut m = 0.0;
+            loop {
+                let end = first + m * step;
+                ends.push(end);
+                if end >= last {
+                    break;
+                }
+                m += 1.0;
+            }
+            ends
+        }
+    };
+
+    let mut windows = Vec::with_capacity(ends.len());
+    let (mut lo, mut hi) = (0, 0);
+    for &end in &ends {
+        while hi < n && timestamps[hi] <= end {
+            hi += 1;
+        }
+        while lo < hi && timestamps[lo] <= end - window {
+            lo += 1;
+        }
+        windows.push((lo, hi));
+    }
+    (windows, ends)
+}
+
+fn compute_rolling(data: &[f64], windows: &[(usize, usize)], bins: Option<usize>) -> RollingStatsResult {
+    let largest_window = windows.iter().map(|&(start, end)| end - start).max().unwrap_or(0);
+    let intervals = match value_range(data, None) {
+        Some((min_val, max_val)) => compute_intervals(min_val, max_val, bins.unwrap_or_else(|| sturges(largest_window))),
+        None => Vec::new(),
+    };
+
+    let mut out = RollingStatsResult {
+        intervals: intervals.clone(),
+        window_start: Vec::with_capacity(windows.len()),
+        window_end: Vec::with_capacity(windows.len()),
+        window_end_time: Vec::new(),
+        count: Vec::with_capacity(windows.len()),
+        mean: Vec::with_capacity(windows.len()),
+        variance: Vec::with_capacity(windows.len()),
+        std: Vec::with_capacity(windows.len()),
+        mean_linear_dev: Vec::with_capacity(windows.len()),
+        variation_coef: Vec::with_capacity(windows.len()),
+        asymmetry: Vec::with_capacity(windows.len()),
+        excess: Vec::with_capacity(windows.len()),
+        histogram: Vec::with_capacity(windows.len() * intervals.len()),
+    };
+
+    let mut hist = RollingHistogram::new(intervals);
+    let (mut lo, mut hi) = (0, 0);
+    for &(start, end) in windows {
+        if start >= hi {
+            hist.clear();
+            lo = start;
+            hi = start;
+        }
+        while hi < end {
+            hist.add(data[hi]);
+            hi += 1;
+        }
+        while lo < start {
+            hist.remove(data[lo]);
+            lo += 1;
+        }
+        out.window_start.push(start);
+        out.window_end.push(end);
+        hist.push_window(&mut out);
+    }
+    out
+}
+
+#[pyclass]
+struct RollingStatsResult {
+    intervals: Vec<(f64, f64)>,
+    window_start: Vec<usize>,
+    window_end: Vec<usize>,
+    window_end_time: Vec<f64>,
+    count: Vec<f64>,
+    mean: Vec<f64>,
+    variance: Vec<f64>,
+    std: Vec<f64>,
+    mean_linear_dev: Vec<f64>,
+    variation_coef: Vec<f64>,
+    asymmetry: Vec<f64>,
+    excess: Vec<f64>,
+    histogram: Vec<f64>,
+}
+
+#[pymethods]
+impl RollingStatsResult {
+    #[getter]
+    fn intervals(&self) -> Vec<(f64, f64)> {
+        self.intervals.clone()
+    }
+
+    #[getter]
+    fn window_start(&self) -> Vec<usize> {
+        self.window_start.clone()
+    }
+
+    #[getter]
+    fn window_end(&self) -> Vec<usize> {
+        self.window_end.clone()
+    }
+
+    #[getter]
+    fn window_end_time(&self) -> Vec<f64> {
+        self.window_end_time.clone()
+    }
+
+    #[getter]
+    fn count(&self) -> Vec<f64> {
+        self.count.clone()
+    }
+
+    #[getter]
+    fn mean(&self) -> Vec<f64> {
+        self.mean.clone()
+    }
+
+    #[getter]
+    fn variance(&self) -> Vec<f64> {
+        self.variance.clone()
+    }
+
+    #[getter]
+    fn std(&self) -> Vec<f64> {
+        self.std.clone()
+    }
+
+    #[getter]
+    fn mean_linear_dev(&self) -> Vec<f64> {
+        self.mean_linear_dev.clone()
+    }
+
+    #[getter]
+    fn variation_coef(&self) -> Vec<f64> {
+        self.variation_coef.clone()
+    }
+
+    #[getter]
+    fn asymmetry(&self) -> Vec<f64> {
+        self.asymmetry.clone()
+    }
+
+    #[getter]
+    fn excess(&self) -> Vec<f64> {
+        self.excess.clone()
+    }
+
+    #[getter]
+    fn histogram(&self) -> Vec<Vec<f64>> {
+        // No intervals (all values NaN): still one, empty, row per window
+        match self.intervals.len() {
+            0 => vec![Vec::new(); self.window_start.len()],
+            k => self.histogram.chunks(k).map(|row| row.to_vec()).collect(),
+        }
+    }
+
+    fn __len__(&self) -> usize {
+        self.window_start.len()
+    }
+
+    /// Writes the `"summary"` table (one row per window) or the
+    /// `"histogram"` table (one row per window and interval) to `path`.
+    ///
+    /// `format` is `"csv"`, `"arrow"` (IPC file) or `"parquet"`; by default
+    /// it is taken from the file extension.
+    #[pyo3(signature = (path, format=None, table="summary"))]
+    fn export(&self, py: Python<'_>, path: &str, format: Option<&str>, table: &str) -> PyResult<()> {
+        let format = ExportFormat::resolve(path, format)?;
+        let batch = rolling_table(self, table)?;
+        py.detach(|| write_record_batch(&batch, path, format))
+    }
+}
+
+/// Grouped statistics over sliding windows of `window` consecutive observations.
+///
+/// All windows share one interval grid built from the whole series, so the
+/// histogram is updated incrementally instead of being rebuilt per window.
+#[pyfunction]
+#[pyo3(signature = (data, window, step=1, bins=None))]
+fn rolling_stats(py: Python<'_>, data: Vec<f64>, window: usize, step: usize, bins: Option<usize>) -> PyResult<RollingStatsResult> {
+    if window == 0 || step == 0 {
+        return Err(PyValueError::new_err("window and step must be positive"));
+    }
+    if bins == Some(0) {
+        return Err(PyValueError::new_err("bins must be positive"));
+    }
+    let windows = count_windows(data.len(), window, step);
+    Ok(py.detach(|| compute_rolling(&data, &windows, bins)))
+}
+
+/// Grouped statistics over time windows `(end - window, end]`.
+///
+/// Without `step` a window ends at every distinct timestamp; with `step`
+/// windows end every `step` time units starting at `timestamps[0]`, so
+/// with `step <= window` every observation falls into at least one
+/// window. In both modes the
+/// first windows cover less than `window` time units of data.
+/// Timestamps must be sorted in non-decreasing order.
+#[pyfunction]
+#[pyo3(signature = (timestamps, data, window, step=None, bins=None))]
+fn rolling_stats_by_time(
+    py: Python<'_>,
+    timestamps: Vec<f64>,
+    data: Vec<f64>,
+    window: f64,
+    step: Option<f64>,
+    bins: Option<usize>,
+) -> PyResult<RollingStatsResult> {
+    if timestamps.len() != data.len() {
+        return Err(PyValueError::new_err(format!(
+            "timestamps length ({}) does not match data length ({})",
+            timestamps.len(),
+            data.len()
+        )));
+    }
+    if !(window > 0.0) || step.map_or(false, |s| !(s > 0.0)) {
+        return Err(PyValueError::new_err("window and step must be positive"));
+    }
+    if bins == Some(0) {
+        return Err(PyValueError::new_err("bins must be positive"));
+    }
+    if timestamps.iter().any(|t| !t.is_finite()) || timestamps.windows(2).any(|w| w[1] < w[0]) {
+        return Err(PyValueError::new_err("timestamps must be finite and sorted"));
+    }
+
+    Ok(py.detach(|| {
+        let (windows, ends) = time_windows(&timestamps, window, step);
+        let mut result = compute_rolling(&data, &windows, bins);
+        result.window_end_time = ends;
+        result
+    }))
+}
+
+// xoshiro256++ seeded through splitmix64, one generator per resample
+struct Xoshiro256 {
+    s: [u64; 4],
+}
+
+impl Xoshiro256 {
+    fn seed_from(seed: u64) -> Self {
+        let mut x = seed;
+        let mut next = || {
+            x = x.wrapping_add(0x9E37_79B9_7F4A_7C15);
+            let mut z = x;
+            z = (z ^ (z >> 30)).wrapping_mul(0xBF58_476D_1CE4_E5B9);
+            z = (z ^ (z >> 27)).wrapping_mul(0x94D0_49BB_1331_11EB);
+            z ^ (z >> 31)
+        };
+        Xoshiro256 { s: [next(), next(), next(), next()] }
+    }
+
+    fn next_u64(&mut self) -> u64 {
+        let result = (self.s[0].wrapping_add(self.s[3])).rotate_left(23).wrapping_add(self.s[0]);
+        let t = self.s[1] << 17;
+        self.s[2] ^= self.s[0];
+        self.s[3] ^= self.s[1];
+        self.s[1] ^= self.s[2];
+        self.s[0] ^= self.s[3];
+        self.s[2] ^= t;
+        self.s[3] = self.s[3].rotate_left(45);
+        result
+    }
+
+    fn below(&mut self, n: u64) -> u64 {
+        ((self.next_u64() as u128 * n as u128) >> 64) as u64
+    }
+}
+
+const BOOTSTRAP_METRICS: usize = 7;
+
+fn bootstrap_metrics(result: &GroupStatsResult) -> [f64; BOOTSTRAP_METRICS] {
+    [
+        result.mean,
+        result.variance,
+        result.std,
+        result.mean_linear_dev,
+        result.variation_coef,
+        result.asymmetry,
+        result.excess,
+    ]
+}
+
+fn percentile(sorted: &[f64], q: f64) -> f64 {
+    if sorted.is_empty() {
+        return f64::NAN;
+    }
+    let pos = q * (sorted.len() - 1) as f64;
+    let lower = pos.floor() as usize;
+    let upper = pos.ceil() as usize;
+    sorted[lower] + (sorted[upper] - sorted[lower]) * (pos - lower as f64)
+}
+
+fn compute_bootstrap(data: &[f64], n_resamples: usize, confidence: f64, seed: u64, n_threads: usize) -> BootstrapResult {
+    // Resampling observations on a fixed grid only changes the interval counts,
+    // so each draw picks an interval with probability ni / n via the cumulative counts
+    let base = compute_group_stats(data, None, &mut Profiler::disabled());
+    let intervals = base.intervals.clone();
+    let cumulative: Vec<u64> = base.si.iter().map(|&s| s as u64).collect();
+    let total = cumulative.last().copied().unwrap_or(0);
+
+    // Guide table: the first interval that can hold each of GUIDE_SIZE equal
+    // slices of [0, total), so a draw needs about one comparison
+    const GUIDE_SIZE: u64 = 1024;
+    let guide_scale = if total > 0 { (GUIDE_SIZE << 32) / total } else { 0 };
+    let guide: Vec<usize> = (0..=GUIDE_SIZE)
+        .map(|g| {
+            let r = if guide_scale == 0 { 0 } else { ((g << 32) + guide_scale - 1) / guide_scale };
+            cumulative.partition_point(|&s| s <= r).min(cumulative.len().saturating_sub(1))
+        })
+        .collect();
+
+    let mut replicates = vec![[0.0; BOOTSTRAP_METRICS]; n_resamples];
+    let chunk_size = n_resamples.div_ceil(n_threads.max(1)).max(1);
+
+    std::thread::scope(|scope| {
+        for (chunk_index, chunk) in replicates.chunks_mut(chunk_size).enumerate() {
+            let intervals = &intervals;
+            let cumulative = &cumulative;
+            let guide = &guide;
+            scope.spawn(move || {
+                let mut ni = vec![0.0; intervals.len()];
+                for (offset, slot) in chunk.iter_mut().enumerate() {
+                    let b = (chunk_index * chunk_size + offset) as u64;
+                    let mut rng = Xoshiro256::seed_from(seed ^ b.wrapping_mul(0xD1B5_4A32_D192_ED03));
+                    ni.iter_mut().for_each(|c| *c = 0.0);
+                    for _ in 0..total {
+                        let r = rng.below(total);
+                        let mut j = guide[(r * guide_scale >> 32) as usize];
+                        while cumulative[j] <= r {
+                            j += 1;
+                        }
+                        ni[j] += 1.0;
+                    }
+                    *slot = bootstrap_metrics(&build_group_stats(intervals.clone(), ni.clone(), &mut Profiler::disabled()));
+                }
+            });
+        }
+    });
+
+    let alpha = 1.0 - confidence;
+    let mut samples: Vec<Vec<f64>> = Vec::with_capacity(BOOTSTRAP_METRICS);
+    let mut intervals_ci = Vec::with_capacity(BOOTSTRAP_METRICS);
+    for m in 0..BOOTSTRAP_METRICS {
+        let mut column: Vec<f64> = replicates.iter().map(|r| r[m]).collect();
+        let mut sorted = column.clone();
+        sorted.sort_by(|a, b| a.total_cmp(b));
+        intervals_ci.push((percentile(&sorted, alpha / 2.0), percentile(&sorted, 1.0 - alpha / 2.0)));
+        samples.push(std::mem::take(&mut column));
+    }
+
+    BootstrapResult {
+        n_resamples,
+        confidence,
+        seed,
+        estimates: bootstrap_metrics(&base),
+        intervals_ci,
+        samples,
+    }
+}
+
+#[pyclass]
+struct BootstrapResult {
+    n_resamples: usize,
+    confidence: f64,
+    seed: u64,
+    estimates: [f64; BOOTSTRAP_METRICS],
+    intervals_ci: Vec<(f64, f64)>,
+    samples: Vec<Vec<f64>>,
+}
+
+#[pymethods]
+impl BootstrapResult {
+    #[getter]
+    fn n_resamples(&self) -> usize {
+        self.n_resamples
+    }
+
+    #[getter]
+    fn confidence(&self) -> f64 {
+        self.confidence
+    }
+
+    #[getter]
+    fn seed(&self) -> u64 {
+        self.seed
+    }
+
+    #[getter]
+    fn mean(&self) -> f64 {
+        self.estimates[0]
+    }
+
+    #[getter]
+    fn variance(&self) -> f64 {
+        self.estimates[1]
+    }
+
+    #[getter]
+    fn std(&self) -> f64 {
+        self.estimates[2]
+    }
+
+    #[getter]
+    fn mean_linear_dev(&self) -> f64 {
+        self.estimates[3]
+    }
+
+    #[getter]
+    fn variation_coef(&self) -> f64 {
+        self.estimates[4]
+    }
+
+    #[getter]
+    fn asymmetry(&self) -> f64 {
+        self.estimates[5]
+    }
+
+    #[getter]
+    fn excess(&self) -> f64 {
+        self.estimates[6]
+    }
+
+    #[getter]
+    fn mean_ci(&self) -> (f64, f64) {
+        self.intervals_ci[0]
+    }
+
+    #[getter]
+    fn variance_ci(&self) -> (f64, f64) {
+        self.intervals_ci[1]
+    }
+
+    #[getter]
+    fn std_ci(&self) -> (f64, f64) {
+        self.intervals_ci[2]
+    }
+
+    #[getter]
+    fn mean_linear_dev_ci(&self) -> (f64, f64) {
+        self.intervals_ci[3]
+    }
+
+    #[getter]
+    fn variation_coef_ci(&self) -> (f64, f64) {
+        self.intervals_ci[4]
+    }
+
+    #[getter]
+    fn asymmetry_ci(&self) -> (f64, f64) {
+        self.intervals_ci[5]
+    }
+
+    #[getter]
+    fn excess_ci(&self) -> (f64, f64) {
+        self.intervals_ci[6]
+    }
+
+    #[getter]
+    fn mean_samples(&self) -> Vec<f64> {
+        self.samples[0].clone()
+    }
+
+    #[getter]
+    fn variance_samples(&self) -> Vec<f64> {
+        self.samples[1].clone()
+    }
+
+    #[getter]
+    fn std_samples(&self) -> Vec<f64> {
+        self.samples[2].clone()
+    }
+
+    #[getter]
+    fn mean_linear_dev_samples(&self) -> Vec<f64> {
+        self.samples[3].clone()
+    }
+
+    #[getter]
+    fn variation_coef_samples(&self) -> Vec<f64> {
+        self.samples[4].clone()
+    }
+
+    #[getter]
+    fn asymmetry_samples(&self) -> Vec<f64> {
+        self.samples[5].clone()
+    }
+
+    #[getter]
+    fn excess_samples(&self) -> Vec<f64> {
+        self.samples[6].clone()
+    }
+}
+
+/// Percentile bootstrap confidence intervals for the grouped statistics.
+///
+/// The sample is resampled `n_resamples` times on the interval grid of the
+/// original data. Every resample has its own generator derived from `seed`
+/// and its index, so results do not depend on `n_threads`.
+#[pyfunction]
+#[pyo3(signature = (data, n_resamples=1000, confidence=0.95, seed=0, n_threads=None))]
+fn bootstrap_group_stats(
+    py: Python<'_>,
+    data: Vec<f64>,
+    n_resamples: usize,
+    confidence: f64,
+    seed: u64,
+    n_threads: Option<usize>,
+) -> PyResult<BootstrapResult> {
+    if data.is_empty() {
+        return Err(PyValueError::new_err("data must not be empty"));
+    }
+    if n_resamples == 0 {
+        return Err(PyValueError::new_err("n_resamples must be positive"));
+    }
+    if !(confidence > 0.0 && confidence < 1.0) {
+        return Err(PyValueError::new_err("confidence must be between 0 and 1"));
+    }
+    let n_threads = n_threads.unwrap_or_else(|| {
+        std::thread::available_parallelism().map(|n| n.get()).unwrap_or(1)
+    });
+    if n_threads == 0 {
+        return Err(PyValueError::new_err("n_threads must be positive"));
+    }
+    Ok(py.detach(|| compute_bootstrap(&data, n_resamples, confidence, seed, n_threads)))
+}
+
+// Levels of GoodnessOfFitResult.ad_critical_values. Published tables are for
+// continuous data with known or estimated parameters, none of them is valid
+// for the grouped statistic, so the critical values are NaN
+const AD_SIGNIFICANCE_LEVELS: [f64; 5] = [15.0, 10.0, 5.0, 2.5, 1.0];
+
+// Cells with fewer expected observations are merged with their neighbours
+const CHI_SQUARE_MIN_EXPECTED: f64 = 5.0;
+
+enum FittedDistribution {
+    Normal(Normal),
+    LogNormal(LogNormal),
+    Exponential(Exp),
+}
+
+impl FittedDistribution {
+    // Estimates parameters by the method of moments from weighted values:
+    // the raw sample when it is available, otherwise the interval midpoints
+    fn fit(distribution: &str, values: &[f64], weights: Option<&[f64]>) -> PyResult<(Self, Vec<f64>)> {
+        let occupied = || {
+            values.iter().enumerate().filter_map(move |(i, &x)| {
+                let w = weights.map_or(1.0, |w| w[i]);
+                if w > 0.0 && x.is_finite() { Some((x, w)) } else { None }
+            })
+        };
+        let total_n: f64 = occupied().map(|(_, w)| w).sum();
+        let sum_xw: f64 = occupied().map(|(x, w)| x * w).sum();
+        let mean = if total_n > 0.0 { sum_xw / total_n } else { 0.0 };
+        let sum_squared: f64 = occupied().map(|(x, w)| (x - mean).powi(2) * w).sum();
+        let variance = compute_variance(sum_squared, total_n);
+
+        match distribution {
+            "normal" => {
+                let std = compute_std(variance);
+                let dist = Normal::new(mean, std)
+                    .map_err(|_| PyValueError::new_err("normal fit needs at least two distinct values"))?;
+                Ok((FittedDistribution::Normal(dist), vec![mean, std]))
+            }
+            "lognormal" => {
+                if occupied().any(|(x, _)| x <= 0.0) {
+                    return Err(PyValueError::new_err("lognormal fit requires positive data"));
+                }
+                let log_variance = (1.0 + variance / (mean * mean)).ln();
+                let log_mean = mean.ln() - log_variance / 2.0;
+                let log_std = log_variance.sqrt();
+                let dist = LogNormal::new(log_mean, log_std)
+                    .map_err(|_| PyValueError::new_err("lognormal fit needs at least two distinct values"))?;
+                Ok((FittedDistribution::LogNormal(dist), vec![log_mean, log_std]))
+            }
+            "exponential" => {
+                if occupied().any(|(x, _)| x < 0.0) {
+                    return Err(PyValueError::new_err("exponential fit requires non-negative data"));
+                }
+                let rate = 1.0 / mean;
+                let dist = Exp::new(rate)
+                    .map_err(|_| PyValueError::new_err("exponential fit requires a positive mean"))?;
+                Ok((FittedDistribution::Exponential(dist), vec![rate]))
+            }
+            _ => Err(PyValueError::new_err(format!(
+                "unknown distribution '{}', expected 'normal', 'lognormal' or 'exponential'",
+                distribution
+            ))),
+        }
+    }
+
+    fn cdf(&self, x: f64) -> f64 {
+        match self {
+            FittedDistribution::Normal(d) => d.cdf(x),
+            FittedDistribution::LogNormal(d) => if x <= 0.0 { 0.0 } else { d.cdf(x) },
+            FittedDistribution::Exponential(d) => if x <= 0.0 { 0.0 } else { d.cdf(x) },
+        }
+    }
+
+    fn estimated_parameters(&self) -> usize {
+        match self {
+            FittedDistribution::Exponential(_) => 1,
+            _ => 2,
+        }
+    }
+}
+
+fn kolmogorov_sf(lambda: f64) -> f64 {
+    if lambda < 0.2 {
+        return 1.0;
+    }
+    let mut sum = 0.0;
+    for k in 1..=100 {
+        let k = k as f64;
+        let term = (-2.0 * k * k * lambda * lambda).exp();
+        sum += if k as u64 % 2 == 1 { term } else { -term };
+        if term < 1e-16 {
+            break;
+        }
+    }
+    (2.0 * sum).clamp(0.0, 1.0)
+}
+
+fn compute_goodness_of_fit(
+    intervals: &[(f64, f64)],
+    ni: &[f64],
+    distribution: &str,
+    sample: Option<(&[f64], Option<&[f64]>)>,
+) -> PyResult<GoodnessOfFitResult> {
+    let total_n = sum_ni(ni);
+    if intervals.is_empty() || total_n == 0.0 {
+        return Err(PyValueError::new_err("goodness-of-fit tests need a non-empty sample"));
+    }
+
+    let (dist, parameters) = match sample {
+        Some((data, weights)) => FittedDistribution::fit(distribution, data, weights)?,
+        None => FittedDistribution::fit(distribution, &compute_xi(intervals), Some(ni))?,
+    };
+
+    // Expected cell probabilities, the tails are folded into the outer intervals
+    let k = intervals.len();
+    let mut cumulative_expected: Vec<f64> = intervals.iter().map(|&(_, end)| dist.cdf(end)).collect();
+    cumulative_expected[k - 1] = 1.0;
+    let expected: Vec<f64> = cumulative_expected.iter()
+        .scan(0.0, |prev, &h| {
+            let p = h - *prev;
+            *prev = h;
+            Some(p)
+        })
+        .collect();
+    let cumulative_observed = compute_si(ni);
+
+    // Pearson chi-square over cells with enough expected observations
+    let mut chi_square = 0.0;
+    let mut cells: usize = 0;
+    let (mut observed_acc, mut expected_acc) = (0.0, 0.0);
+    let mut last_cell: Option<(f64, f64)> = None;
+    for (&o, &p) in ni.iter().zip(expected.iter()) {
+        observed_acc += o;
+        expected_acc += p * total_n;
+        if expected_acc >= CHI_SQUARE_MIN_EXPECTED {
+            if let Some((lo, le)) = last_cell {
+                chi_square += (lo - le).powi(2) / le;
+                cells += 1;
+            }
+            last_cell = Some((observed_acc, expected_acc));
+            observed_acc = 0.0;
+            expected_acc = 0.0;
+        }
+    }
+    match last_cell {
+        Some((lo, le)) => {
+            let (lo, le) = (lo + observed_acc, le + expected_acc);
+            chi_square += (lo - le).powi(2) / le;
+            cells += 1;
+        }
+        None => {
+            if expected_acc > 0.0 {
+                chi_square += (observed_acc - expected_acc).powi(2) / expected_acc;
+                cells += 1;
+            }
+        }
+    }
+    let chi_square_df = cells.saturating_sub(1 + dist.estimated_parameters());
+    let chi_square_p_value = match ChiSquared::new(chi_square_df as f64) {
+        Ok(chi) if chi_square_df > 0 => chi.sf(chi_square),
+        _ => f64::NAN,
+    };
+
+    // Kolmogorov-Smirnov and Anderson-Darling on the interval boundaries,
+    // KS also sees the probability mass below the first and above the last one
+    let mut ks_statistic = dist.cdf(intervals[0].0).max(1.0 - dist.cdf(intervals[k - 1].1));
+    let mut ad_statistic = 0.0;
+    for j in 0..k - 1 {
+        let h = cumulative_expected[j];
+        let z = cumulative_observed[j] / total_n - h;
+        ks_statistic = ks_statistic.max(z.abs());
+        if h > 0.0 && h < 1.0 {
+            ad_statistic += z * z * expected[j] / (h * (1.0 - h));
+        }
+    }
+    ad_statistic *= total_n;
+
+    Ok(GoodnessOfFitResult {
+        distribution: distribution.to_string(),
+        parameters,
+        sum_ni: total_n,
+        chi_square,
+        chi_square_df,
+        chi_square_p_value,
+        ks_statistic,
+        ad_statistic,
+    })
+}
+
+#[pyclass]
+struct GoodnessOfFitResult {
+    distribution: String,
+    parameters: Vec<f64>,
+    sum_ni: f64,
+    chi_square: f64,
+    chi_square_df: usize,
+    chi_square_p_value: f64,
+    ks_statistic: f64,
+    ad_statistic: f64,
+}
+
+#[pymethods]
+impl GoodnessOfFitResult {
+    #[getter]
+    fn distribution(&self) -> String {
+        self.distribution.clone()
+    }
+
+    #[getter]
+    fn parameters(&self) -> Vec<f64> {
+        self.parameters.clone()
+    }
+
+    #[getter]
+    fn sum_ni(&self) -> f64 {
+        self.sum_ni
+    }
+
+    #[getter]
+    fn chi_square(&self) -> f64 {
+        self.chi_square
+    }
+
+    #[getter]
+    fn chi_square_df(&self) -> usize {
+        self.chi_square_df
+    }
+
+    #[getter]
+    fn chi_square_p_value(&self) -> f64 {
+        self.chi_square_p_value
+    }
+
+    #[getter]
+    fn ks_statistic(&self) -> f64 {
+        self.ks_statistic
+    }
+
+    /// Always NaN: the Kolmogorov distribution assumes known parameters,
+    /// with parameters fitted to the same grouped sample it almost never rejects.
+    #[getter]
+    fn ks_p_value(&self) -> f64 {
+        f64::NAN
+    }
+
+    #[getter]
+    fn ad_statistic(&self) -> f64 {
+        self.ad_statistic
+    }
+
+    /// NaN for every level of `ad_significance_levels`, there is no valid
+    /// table for the grouped statistic with fitted parameters.
+    #[getter]
+    fn ad_critical_values(&self) -> Vec<f64> {
+        vec![f64::NAN; AD_SIGNIFICANCE_LEVELS.len()]
+    }
+
+    #[getter]
+    fn ad_significance_levels(&self) -> Vec<f64> {
+        AD_SIGNIFICANCE_LEVELS.to_vec()
+    }
+}
+
+/// Chi-square, Kolmogorov-Smirnov and Anderson-Darling tests of the grouped
+/// sample against a `normal`, `lognormal` or `exponential` distribution.
+///
+/// The data is binned once on the Sturges grid of `group_stats` and all three
+/// statistics are computed from the interval frequencies; only the parameter
+/// estimates use the raw values. Only the chi-square test has a p-value: the
+/// KS p-value and the AD critical values are NaN, because the parameters are
+/// estimated from the same grouped sample.
+#[pyfunction]
+#[pyo3(signature = (data, distribution="normal", weights=None))]
+fn goodness_of_fit(data: Vec<f64>, distribution: &str, weights: Option<Vec<f64>>) -> PyResult<GoodnessOfFitResult> {
+    if let Some(w) = &weights {
+        validate_weights(&data, w)?;
+    }
+    let weights = weights.as_deref();
+    let (intervals, ni) = group_sample(&data, weights, &mut Profiler::disabled());
+    compute_goodness_of_fit(&intervals, &ni, distribution, Some((&data, weights)))
+}
+
+/// Goodness-of-fit tests from an existing grouping: `intervals` and their frequencies `ni`.
+#[pyfunction]
+#[pyo3(signature = (intervals, ni, distribution="normal"))]
+fn goodness_of_fit_binned(intervals: Vec<(f64, f64)>, ni: Vec<f64>, distribution: &str) -> PyResult<GoodnessOfFitResult> {
+    if intervals.len() != ni.len() {
+        return Err(PyValueError::new_err(format!(
+            "ni length ({}) does not match number of intervals ({})",
+            ni.len(),
+            intervals.len()
+        )));
+    }
+    if ni.iter().any(|&n| !n.is_finite() || n < 0.0) {
+        return Err(PyValueError::new_err("ni must be finite and non-negative"));
+    }
+    compute_goodness_of_fit(&intervals, &ni, distribution, None)
+}
+
+// Probability floor for empty intervals in PSI and KL divergence
+const DISTRIBUTION_EPSILON: f64 = 1e-4;
+
+fn relative_frequencies(ni: &[f64]) -> Vec<f64> {
+    let total_n = sum_ni(ni);
+    ni.iter()
+        .map(|&n| if total_n > 0.0 { n / total_n } else { 0.0 })
+        .collect()
+}
+
+fn compute_comparison(current: &[f64], reference: &[f64], bins: Option<usize>, n_threads: usize) -> ComparisonResult {
+    let range_current = value_range(current, None);
+    let range_reference = value_range(reference, None);
+    let range = match (range_current, range_reference) {
+        (Some((a_min, a_max)), Some((b_min, b_max))) => Some((a_min.min(b_min), a_max.max(b_max))),
+        (range, None) | (None, range) => range,
+    };
+    let intervals = match range {
+        Some((min_val, max_val)) => compute_intervals(min_val, max_val, bins.unwrap_or_else(|| sturges(current.len() + reference.len()))),
+        None => Vec::new(),
+    };
+
+    let mut freqs = count_frequencies_parallel(&[current, reference], &intervals, n_threads);
+    let ni_reference = freqs.pop().unwrap_or_default();
+    let ni_current = freqs.pop().unwrap_or_default();
+
+    let wi_current = relative_frequencies(&ni_current);
+    let wi_reference = relative_frequencies(&ni_reference);
+
+    // Two-sample Kolmogorov-Smirnov on the shared interval boundaries
+    let n_current = sum_ni(&ni_current);
+    let n_reference = sum_ni(&ni_reference);
+    let ks_statistic = compute_si(&wi_current).iter()
+        .zip(compute_si(&wi_reference).iter())
+        .map(|(&a, &b)| (a - b).abs())
+        .fold(0.0, f64::max);
+    let effective_n = if n_current + n_reference > 0.0 {
+        n_current * n_reference / (n_current + n_reference)
+    } else {
+        0.0
+    };
+    let ks_p_value = if effective_n > 0.0 {
+        let sqrt_n = effective_n.sqrt();
+        kolmogorov_sf((sqrt_n + 0.12 + 0.11 / sqrt_n) * ks_statistic)
+    } else {
+        f64::NAN
+    };
+
+    let mut psi = 0.0;
+    let mut kl_divergence = 0.0;
+    for (&p, &q) in wi_current.iter().zip(wi_reference.iter()) {
+        let p = p.max(DISTRIBUTION_EPSILON);
+        let q = q.max(DISTRIBUTION_EPSILON);
+        psi += (p - q) * (p / q).ln();
+        kl_divergence += p * (p / q).ln();
+    }
+
+    ComparisonResult {
+        current: build_group_stats(intervals.clone(), ni_current, &mut Profiler::disabled()),
+        reference: build_group_stats(intervals.clone(), ni_reference, &mut Profiler::disabled()),
+        intervals,
+        wi_current,
+        wi_reference,
+        ks_statistic,
+        ks_p_value,
+        psi,
+        kl_divergence,
+    }
+}
+
+#[pyclass]
+struct ComparisonResult {
+    intervals: Vec<(f64, f64)>,
+    current: GroupStatsResult,
+    reference: GroupStatsResult,
+    wi_current: Vec<f64>,
+    wi_reference: Vec<f64>,
+    ks_statistic: f64,
+    ks_p_value: f64,
+    psi: f64,
+    kl_divergence: f64,
+}
+
+#[pymethods]
+impl ComparisonResult {
+    #[getter]
+    fn intervals(&self) -> Vec<(f64, f64)> {
+        self.intervals.clone()
+    }
+
+    #[getter]
+    fn current(&self) -> GroupStatsResult {
+        self.current.clone()
+    }
+
+    #[getter]
+    fn reference(&self) -> GroupStatsResult {
+        self.reference.clone()
+    }
+
+    #[getter]
+    fn ni_current(&self) -> Vec<f64> {
+        self.current.ni.clone()
+    }
+
+    #[getter]
+    fn ni_reference(&self) -> Vec<f64> {
+        self.reference.ni.clone()
+    }
+
+    #[getter]
+    fn wi_current(&self) -> Vec<f64> {
+        self.wi_current.clone()
+    }
+
+    #[getter]
+    fn wi_reference(&self) -> Vec<f64> {
+        self.wi_reference.clone()
+    }
+
+    #[getter]
+    fn mean_diff(&self) -> f64 {
+        self.current.mean - self.reference.mean
+    }
+
+    #[getter]
+    fn variance_diff(&self) -> f64 {
+        self.current.variance - self.reference.variance
+    }
+
+    #[getter]
+    fn std_diff(&self) -> f64 {
+        self.current.std - self.reference.std
+    }
+
+    #[getter]
+    fn mean_linear_dev_diff(&self) -> f64 {
+        self.current.mean_linear_dev - self.reference.mean_linear_dev
+    }
+
+    #[getter]
+    fn variation_coef_diff(&self) -> f64 {
+        self.current.variation_coef - self.reference.variation_coef
+    }
+
+    #[getter]
+    fn asymmetry_diff(&self) -> f64 {
+        self.current.asymmetry - self.reference.asymmetry
+    }
+
+    #[getter]
+    fn excess_diff(&self) -> f64 {
+        self.current.excess - self.reference.excess
+    }
+
+    #[getter]
+    fn ks_statistic(&self) -> f64 {
+        self.ks_statistic
+    }
+
+    #[getter]
+    fn ks_p_value(&self) -> f64 {
+        self.ks_p_value
+    }
+
+    #[getter]
+    fn psi(&self) -> f64 {
+        self.psi
+    }
+
+    #[getter]
+    fn kl_divergence(&self) -> f64 {
+        self.kl_divergence
+    }
+}
+
+/// Compares two samples on one interval grid built from their combined range.
+///
+/// Differences are `current - reference`; PSI and KL divergence
+/// (current relative to reference) use a 1e-4 floor for empty intervals.
+#[pyfunction]
+#[pyo3(signature = (current, reference, bins=None, n_threads=None))]
+fn compare_samples(
+    py: Python<'_>,
+    current: &Bound<'_, PyAny>,
+    reference: &Bound<'_, PyAny>,
+    bins: Option<usize>,
+    n_threads: Option<usize>,
+) -> PyResult<ComparisonResult> {
+    let current = extract_values(current)?;
+    let reference = extract_values(reference)?;
+    if bins == Some(0) {
+        return Err(PyValueError::new_err("bins must be positive"));
+    }
+    let n_threads = n_threads.unwrap_or_else(|| {
+        std::thread::available_parallelism().map(|n| n.get()).unwrap_or(1)
+    });
+    if n_threads == 0 {
+        return Err(PyValueError::new_err("n_threads must be positive"));
+    }
+    Ok(py.detach(|| compute_comparison(&current, &reference, bins, n_threads)))
+}
+
+// Compact storage: float32, or int32 holding value * 10^decimals
+enum CompactValues {
+    Float32(Vec<f32>),
+    Scaled { values: Vec<i32>, decimals: u32 },
+}
+
+const MAX_SCALED_DECIMALS: u32 = 9;
+
+// min/max and interval estimates of the stored types, same kernel layout as
+// the f64 ones. use_avx2 must only be true when the CPU supports AVX2.
+fn min_max_f32(data: &[f32], use_avx2: bool) -> (f32, f32) {
+    #[cfg(target_arch = "x86_64")]
+    if use_avx2 {
+        return unsafe { min_max_f32_avx2(data) };
+    }
+    let _ = use_avx2;
+    min_max_f32_scalar(data)
+}
+
+fn min_max_f32_scalar(data: &[f32]) -> (f32, f32) {
+    let mut mins = [f32::INFINITY; SIMD_LANES];
+    let mut maxs = [f32::NEG_INFINITY; SIMD_LANES];
+
+    let mut chunks = data.chunks_exact(SIMD_LANES);
+    for chunk in &mut chunks {
+        for lane in 0..SIMD_LANES {
+            mins[lane] = mins[lane].min(chunk[lane]);
+            maxs[lane] = maxs[lane].max(chunk[lane]);
+        }
+    }
+    for &x in chunks.remainder() {
+        mins[0] = mins[0].min(x);
+        maxs[0] = maxs[0].max(x);
+    }
+    (
+        mins.iter().fold(f32::INFINITY, |acc, &x| acc.min(x)),
+        maxs.iter().fold(f32::NEG_INFINITY, |acc, &x| acc.max(x)),
+    )
+}
+
+#[cfg(target_arch = "x86_64")]
+#[target_feature(enable = "avx2")]
+unsafe fn min_max_f32_avx2(data: &[f32]) -> (f32, f32) {
+    use std::arch::x86_64::*;
+
+    // Data in the first operand skips NaN, as in min_max_avx2
+    let mut min_v = _mm256_set1_ps(f32::INFINITY);
+    let mut max_v = _mm256_set1_ps(f32::NEG_INFINITY);
+    let mut chunks = data.chunks_exact(2 * SIMD_LANES);
+    for chunk in &mut chunks {
+        let a = _mm256_loadu_ps(chunk.as_ptr());
+        min_v = _mm256_min_ps(a, min_v);
+        max_v = _mm256_max_ps(a, max_v);
+    }
+
+    let mut mins = [0.0; 2 * SIMD_LANES];
+    let mut maxs = [0.0; 2 * SIMD_LANES];
+    _mm256_storeu_ps(mins.as_mut_ptr(), min_v);
+    _mm256_storeu_ps(maxs.as_mut_ptr(), max_v);
+
+    let (tail_min, tail_max) = min_max_f32_scalar(chunks.remainder());
+    (
+        mins.iter().fold(tail_min, |acc, &x| acc.min(x)),
+        maxs.iter().fold(tail_max, |acc, &x| acc.max(x)),
+    )
+}
+
+fn min_max_i32(data: &[i32], use_avx2: bool) -> (i32, i32) {
+    #[cfg(target_arch = "x86_64")]
+    if use_avx2 {
+        return unsafe { min_max_i32_avx2(data) };
+    }
+    let _ = use_avx2;
+    min_max_i32_scalar(data)
+}
+
+fn min_max_i32_scalar(data: &[i32]) -> (i32, i32) {
+    let mut mins = [i32::MAX; SIMD_LANES];
+    let mut maxs = [i32::MIN; SIMD_LANES];
+
+    let mut chunks = data.chunks_exact(SIMD_LANES);
+    for chunk in &mut chunks {
+        for lane in 0..SIMD_LANES {
+            mins[lane] = mins[lane].min(chunk[lane]);
+            maxs[lane] = maxs[lane].max(chunk[lane]);
+        }
+    }
+    for &x in chunks.remainder() {
+        mins[0] = mins[0].min(x);
+        maxs[0] = maxs[0].max(x);
+    }
+    (*mins.iter().min().unwrap(), *maxs.iter().max().unwrap())
+}
+
+#[cfg(target_arch = "x86_64")]
+#[target_feature(enable = "avx2")]
+unsafe fn min_max_i32_avx2(data: &[i32]) -> (i32, i32) {
+    use std::arch::x86_64::*;
+
+    let mut min_v = _mm256_set1_epi32(i32::MAX);
+    let mut max_v = _mm256_set1_epi32(i32::MIN);
+    let mut chunks = data.chunks_exact(2 * SIMD_LANES);
+    for chunk in &mut chunks {
+        let a = _mm256_loadu_si256(chunk.as_ptr() as *const __m256i);
+        min_v = _mm256_min_epi32(a, min_v);
+        max_v = _mm256_max_epi32(a, max_v);
+    }
+
+    let mut mins = [0i32; 2 * SIMD_LANES];
+    let mut maxs = [0i32; 2 * SIMD_LANES];
+    _mm256_storeu_si256(mins.as_mut_ptr() as *mut __m256i, min_v);
+    _mm256_storeu_si256(maxs.as_mut_ptr() as *mut __m256i, max_v);
+
+    let (tail_min, tail_max) = min_max_i32_scalar(chunks.remainder());
+    (
+        mins.iter().fold(tail_min, |acc, &x| acc.min(x)),
+        maxs.iter().fold(tail_max, |acc, &x| acc.max(x)),
+    )
+}
+
+// Estimates for float32 values, widened to f64 before the arithmetic of bin_estimates
+fn bin_estimates_f32(values: &[f32], min_val: f64, inv_width: f64, last: usize, out: &mut [u32], use_avx2: bool) {
+    #[cfg(target_arch = "x86_64")]
+    if use_avx2 {
+        unsafe { bin_estimates_f32_avx2(values, min_val, inv_width, last, out) };
+        return;
+    }
+    let _ = use_avx2;
+    bin_estimates_f32_scalar(values, min_val, inv_width, last, out);
+}
+
+fn bin_estimates_f32_scalar(values: &[f32], min_val: f64, inv_width: f64, last: usize, out: &mut [u32]) {
+    for (estimate, &value) in out.iter_mut().zip(values) {
+        *estimate = (((value as f64 - min_val) * inv_width) as usize).min(last) as u32;
+    }
+}
+
+#[cfg(target_arch = "x86_64")]
+#[target_feature(enable = "avx2")]
+unsafe fn bin_estimates_f32_avx2(values: &[f32], min_val: f64, inv_width: f64, last: usize, out: &mut [u32]) {
+    use std::arch::x86_64::*;
+
+    let min_v = _mm256_set1_pd(min_val);
+    let inv_v = _mm256_set1_pd(inv_width);
+    let zero = _mm_setzero_si128();
+    let last_v = _mm_set1_epi32(last as i32);
+
+    let mut chunks = values.chunks_exact(SIMD_LANES);
+    let mut out_chunks = out.chunks_exact_mut(SIMD_LANES);
+    for (chunk, estimates) in (&mut chunks).zip(&mut out_chunks) {
+        let wide = _mm256_cvtps_pd(_mm_loadu_ps(chunk.as_ptr()));
+        let index = _mm256_cvttpd_epi32(_mm256_mul_pd(_mm256_sub_pd(wide, min_v), inv_v));
+        let index = _mm_min_epi32(_mm_max_epi32(index, zero), last_v);
+        _mm_storeu_si128(estimates.as_mut_ptr() as *mut __m128i, index);
+    }
+    bin_estimates_f32_scalar(chunks.remainder(), min_val, inv_width, last, out_chunks.into_remainder());
+}
+
+// Estimates for scaled integers; min_val and inv_width are in scaled units
+fn bin_estimates_i32(values: &[i32], min_val: f64, inv_width: f64, last: usize, out: &mut [u32], use_avx2: bool) {
+    #[cfg(target_arch = "x86_64")]
+    if use_avx2 {
+        unsafe { bin_estimates_i32_avx2(values, min_val, inv_width, last, out) };
+        return;
+    }
+    let _ = use_avx2;
+    bin_estimates_i32_scalar(values, min_val, inv_width, last, out);
+}
+
+fn bin_estimates_i32_scalar(values: &[i32], min_val: f64, inv_width: f64, last: usize, out: &mut [u32]) {
+    for (estimate, &value) in out.iter_mut().zip(values) {
+        *estimate = (((value as f64 - min_val) * inv_width) as usize).min(last) as u32;
+    }
+}
+
+#[cfg(target_arch = "x86_64")]
+#[target_feature(enable = "avx2")]
+unsafe fn bin_estimates_i32_avx2(values: &[i32], min_val: f64, inv_width: f64, last: usize, out: &mut [u32]) {
+    use std::arch::x86_64::*;
+
+    let min_v = _mm256_set1_pd(min_val);
+    let inv_v = _mm256_set1_pd(inv_width);
+    let zero = _mm_setzero_si128();
+    let last_v = _mm_set1_epi32(last as i32);
+
+    let mut chunks = values.chunks_exact(SIMD_LANES);
+    let mut out_chunks = out.chunks_exact_mut(SIMD_LANES);
+    for (chunk, estimates) in (&mut chunks).zip(&mut out_chunks) {
+        let wide = _mm256_cvtepi32_pd(_mm_loadu_si128(chunk.as_ptr() as *const __m128i));
+        let index = _mm256_cvttpd_epi32(_mm256_mul_pd(_mm256_sub_pd(wide, min_v), inv_v));
+        let index = _mm_min_epi32(_mm_max_epi32(index, zero), last_v);
+        _mm_storeu_si128(estimates.as_mut_ptr() as *mut __m128i, index);
+    }
+    bin_estimates_i32_scalar(chunks.remainder(), min_val, inv_width, last, out_chunks.into_remainder());
+}
+
+// Value range of the stored sample, found in one pass
+fn compact_range(values: &CompactValues, use_avx2: bool) -> Option<(f64, f64)> {
+    let (min_val, max_val) = match values {
+        CompactValues::Float32(data) => {
+            let (min_val, max_val) = min_max_f32(data, use_avx2);
+            (min_val as f64, max_val as f64)
+        }
+        CompactValues::Scaled { values, decimals } => {
+            let (min_val, max_val) = min_max_i32(values, use_avx2);
+            let scale = 10f64.powi(*decimals as i32);
+            (min_val as f64 / scale, max_val as f64 / scale)
+        }
+    };
+    if min_val > max_val {
+        None
+    } else {
+        Some((min_val, max_val))
+    }
+}
+
+fn count_frequencies_f32(data: &[f32], intervals: &[(f64, f64)], use_avx2: bool) -> Vec<f64> {
+    if intervals.is_empty() {
+        return Vec::new();
+    }
+    let mut freqs = vec![0u64; intervals.len()];
+
+    let last = intervals.len() - 1;
+    let min_val = intervals[0].0;
+    let width = (intervals[last].1 - min_val) / intervals.len() as f64;
+    let inv_width = if width > 0.0 { 1.0 / width } else { 0.0 };
+    let mut estimates = [0u32; BIN_BLOCK];
+
+    for block in data.chunks(BIN_BLOCK) {
+        let estimates = &mut estimates[..block.len()];
+        bin_estimates_f32(block, min_val, inv_width, last, estimates, use_avx2);
+        for (&value, &estimate) in block.iter().zip(estimates.iter()) {
+            if let Some(i) = refine_bin(value as f64, estimate as usize, intervals) {
+                freqs[i] += 1;
+            }
+        }
+    }
+    freqs.into_iter().map(|f| f as f64).collect()
+}
+
+// Smallest scaled integer v with v / scale >= start, for each interval start
+fn scaled_thresholds(intervals: &[(f64, f64)], scale: f64) -> Vec<i64> {
+    intervals.iter()
+        .map(|&(start, _)| {
+            let mut t = (start * scale).ceil() as i64;
+            while (t - 1) as f64 / scale >= start {
+                t -= 1;
+            }
+            while (t as f64) / scale < start {
+                t += 1;
+            }
+            t
+        })
+        .collect()
+}
+
+fn count_frequencies_scaled(values: &[i32], decimals: u32, intervals: &[(f64, f64)], use_avx2: bool) -> Vec<f64> {
+    let k = intervals.len();
+    if k == 0 {
+        return Vec::new();
+    }
+    let mut freqs = vec![0u64; k];
+
+    // Same intervals as binning value / 10^decimals in f64, but compared in integers;
+    // the estimate only has to be close, the thresholds decide
+    let scale = 10f64.powi(decimals as i32);
+    let thresholds = scaled_thresholds(intervals, scale);
+    let last = k - 1;
+    let min_val = intervals[0].0 * scale;
+    let width = (intervals[last].1 - intervals[0].0) * scale / k as f64;
+    let inv_width = if width > 0.0 { 1.0 / width } else { 0.0 };
+    let mut estimates = [0u32; BIN_BLOCK];
+
+    for block in values.chunks(BIN_BLOCK) {
+        let estimates = &mut estimates[..block.len()];
+        bin_estimates_i32(block, min_val, inv_width, last, estimates, use_avx2);
+        for (&v, &estimate) in block.iter().zip(estimates.iter()) {
+            let v = v as i64;
+            let mut i = estimate as usize;
+            while i > 0 && v < thresholds[i] {
+                i -= 1;
+            }
+            while i < last && v >= thresholds[i + 1] {
+                i += 1;
+            }
+            freqs[i] += 1;
+        }
+    }
+    freqs.into_iter().map(|f| f as f64).collect()
+}
+
+fn compute_compact_group_stats(values: &CompactValues, profiler: &mut Profiler) -> GroupStatsResult {
+    let use_avx2 = avx2_enabled();
+    let n = match values {
+        CompactValues::Float32(data) => data.len(),
+        CompactValues::Scaled { values, .. } => values.len(),
+    };
+    let intervals = match compact_range(values, use_avx2) {
+        Some((min_val, max_val)) => compute_intervals(min_val, max_val, sturges(n)),
+        None => Vec::new(),
+    };
+    profiler.phase("compute_intervals");
+
+    let ni = match values {
+        CompactValues::Float32(data) => count_frequencies_f32(data, &intervals, use_avx2),
+        CompactValues::Scaled { values, decimals } => count_frequencies_scaled(values, *decimals, &intervals, use_avx2),
+    };
+    profiler.phase("count_frequencies");
+    build_group_stats(intervals, ni, profiler)
+}
+
+fn scale_to_i32(data: &[f64], decimals: u32) -> PyResult<Vec<i32>> {
+    let scale = 10f64.powi(decimals as i32);
+    data.iter()
+        .map(|&x| {
+            let scaled = (x * scale).round();
+            if scaled.is_finite() && scaled >= i32::MIN as f64 && scaled <= i32::MAX as f64 {
+                Ok(scaled as i32)
+            } else {
+                Err(PyValueError::new_err(format!(
+                    "value {} does not fit into int32 with {} decimals",
+                    x, decimals
+                )))
+            }
+        })
+        .collect()
+}
+
+/// Sample stored as float32 or as int32 scaled by `10**decimals`.
+///
+/// `dtype="float32"` halves the size of a float64 buffer at the cost of
+/// float32 precision; `dtype="scaled"` is exact for data measured to
+/// `decimals` places. Binning runs on the stored type.
+#[pyclass]
+struct CompactSample {
+    values: CompactValues,
+}
+
+#[pymethods]
+impl CompactSample {
+    #[new]
+    #[pyo3(signature = (data, dtype="float32", decimals=None))]
+    fn new(data: &Bound<'_, PyAny>, dtype: &str, decimals: Option<u32>) -> PyResult<Self> {
+        let values = match (dtype, decimals) {
+            ("float32", None) => {
+                // float32 buffers are copied as they are, float64 buffers and
+                // sequences are read as f64 and narrowed here
+                let values = match extract_buffer::<f32>(data) {
+                    Some(values) => values?,
+                    None => extract_values(data)?.into_iter().map(|x| x as f32).collect(),
+                };
+                CompactValues::Float32(values)
+            }
+            ("float32", Some(_)) => {
+                return Err(PyValueError::new_err("decimals only applies to dtype='scaled'"));
+            }
+            ("scaled", Some(decimals)) if decimals <= MAX_SCALED_DECIMALS => {
+                let data = extract_values(data)?;
+                CompactValues::Scaled { values: scale_to_i32(&data, decimals)?, decimals }
+            }
+            ("scaled", _) => {
+                return Err(PyValueError::new_err(format!(
+                    "dtype='scaled' needs decimals between 0 and {}",
+                    MAX_SCALED_DECIMALS
+                )));
+            }
+            _ => {
+                return Err(PyValueError::new_err(format!(
+                    "unknown dtype '{}', expected 'float32' or 'scaled'",
+                    dtype
+                )));
+            }
+        };
+        Ok(CompactSample { values })
+    }
+
+    /// Wraps integers that already hold `value * 10**decimals`.
+    #[staticmethod]
+    fn from_scaled_ints(values: &Bound<'_, PyAny>, decimals: u32) -> PyResult<Self> {
+        if decimals > MAX_SCALED_DECIMALS {
+            return Err(PyValueError::new_err(format!(
+                "decimals must be between 0 and {}",
+                MAX_SCALED_DECIMALS
+            )));
+        }
+        // int64 buffers (numpy's default integer) are narrowed with a range check
+        let values = match extract_buffer::<i32>(values) {
+            Some(values) => values?,
+            None => match extract_buffer::<i64>(values) {
+                Some(wide) => wide?
+                    .into_iter()
+                    .map(|v| i32::try_from(v).map_err(|_| PyValueError::new_err(format!("value {} does not fit into int32", v))))
+                    .collect::<PyResult<Vec<i32>>>()?,
+                None => values.extract::<Vec<i32>>()?,
+            },
+        };
+        Ok(CompactSample { values: CompactValues::Scaled { values, decimals } })
+    }
+
+    #[getter]
+    fn dtype(&self) -> &'static str {
+        match self.values {
+            CompactValues::Float32(_) => "float32",
+            CompactValues::Scaled { .. } => "scaled",
+        }
+    }
+
+    #[getter]
+    fn decimals(&self) -> Option<u32> {
+        match self.values {
+            CompactValues::Float32(_) => None,
+            CompactValues::Scaled { decimals, .. } => Some(decimals),
+        }
+    }
+
+    #[getter]
+    fn nbytes(&self) -> usize {
+        self.__len__() * 4
+    }
+
+    fn __len__(&self) -> usize {
+        match &self.values {
+            CompactValues::Float32(values) => values.len(),
+            CompactValues::Scaled { values, .. } => values.len(),
+        }
+    }
+
+    fn to_list(&self) -> Vec<f64> {
+        match &self.values {
+            CompactValues::Float32(values) => values.iter().map(|&x| x as f64).collect(),
+            CompactValues::Scaled { values, decimals } => {
+                let scale = 10f64.powi(*decimals as i32);
+                values.iter().map(|&v| v as f64 / scale).collect()
+            }
+        }
+    }
+
+    /// Same result as `group_stats(self.to_list())` without decoding the buffer.
+    #[pyo3(signature = (profile=false))]
+    fn group_stats(&self, py: Python<'_>, profile: bool) -> GroupStatsResult {
+        let mut profiler = Profiler::new(profile);
+        let mut result = py.detach(|| compute_compact_group_stats(&self.values, &mut profiler));
+        result.timings = profiler.finish();
+        result
+    }
+}
+
+#[derive(Clone, Copy)]
+enum ExportFormat {
+    Csv,
+    ArrowIpc,
+    Parquet,
+}
+
+impl ExportFormat {
+    // Explicit format name, otherwise the file extension
+    fn resolve(path: &str, format: Option<&str>) -> PyResult<Self> {
+        let name = match format {
+            Some(format) => format.to_ascii_lowercase(),
+            None => Path::new(path)
+                .extension()
+                .and_then(|ext| ext.to_str())
+                .unwrap_or("")
+                .to_ascii_lowercase(),
+        };
+        match name.as_str() {
+            "csv" => Ok(ExportFormat::Csv),
+            "arrow" | "ipc" | "feather" => Ok(ExportFormat::ArrowIpc),
+            "parquet" | "pq" => Ok(ExportFormat::Parquet),
+            _ => Err(PyValueError::new_err(format!(
+                "unknown export format '{}', expected 'csv', 'arrow' or 'parquet'",
+                name
+            ))),
+        }
+    }
+}
+
+fn export_error(e: impl std::fmt::Display) -> PyErr {
+    PyIOError::new_err(e.to_string())
+}
+
+fn f64_column(values: Vec<f64>) -> ArrayRef {
+    Arc::new(Float64Array::from(values))
+}
+
+fn u64_column(values: Vec<u64>) -> ArrayRef {
+    Arc::new(UInt64Array::from(values))
+}
+
+fn record_batch(columns: Vec<(&'static str, ArrayRef)>) -> PyResult<RecordBatch> {
+    let fields: Vec<Field> = columns
+        .iter()
+        .map(|(name, array)| Field::new(*name, array.data_type().clone(), false))
+        .collect();
+    let arrays = columns.into_iter().map(|(_, array)| array).collect();
+    RecordBatch::try_new(Arc::new(Schema::new(fields)), arrays).map_err(|e| PyValueError::new_err(e.to_string()))
+}
+
+// The columns go to the writer as they are, rows are never materialised
+fn write_record_batch(batch: &RecordBatch, path: &str, format: ExportFormat) -> PyResult<()> {
+    let file = File::create(path)?;
+    match format {
+        ExportFormat::Csv => {
+            let mut out = BufWriter::new(file);
+            write_csv(batch, &mut out)?;
+            out.flush()?;
+        }
+        ExportFormat::ArrowIpc => {
+            let mut out = BufWriter::new(file);
+            {
+                let mut writer = FileWriter::try_new(&mut out, &batch.schema()).map_err(export_error)?;
+                writer.write(batch).map_err(export_error)?;
+                writer.finish().map_err(export_error)?;
+            }
+            out.flush()?;
+        }
+        ExportFormat::Parquet => {
+            let properties = WriterProperties::builder()
+                .set_compression(Compression::SNAPPY)
+                .build();
+            let mut writer = ArrowWriter::try_new(file, batch.schema(), Some(properties)).map_err(export_error)?;
+            writer.write(batch).map_err(export_error)?;
+            writer.close().map_err(export_error)?;
+        }
+    }
+    Ok(())
+}
+
+enum CsvColumn<'a> {
+    F64(&'a [f64]),
+    U64(&'a [u64]),
+}
+
+const CSV_BLOCK_ROWS: usize = 1 << 16;
+
+// ryu and itoa give the shortest text that reads back to the same value
+fn format_csv_rows(columns: &[CsvColumn], rows: std::ops::Range<usize>) -> Vec<u8> {
+    let mut floats = ryu::Buffer::new();
+    let mut integers = itoa::Buffer::new();
+    let mut text = Vec::with_capacity(24 * columns.len() * rows.len());
+    for i in rows {
+        for (j, column) in columns.iter().enumerate() {
+            if j > 0 {
+                text.push(b',');
+            }
+            match column {
+                CsvColumn::F64(values) => text.extend_from_slice(floats.format(values[i]).as_bytes()),
+                CsvColumn::U64(values) => text.extend_from_slice(integers.format(values[i]).as_bytes()),
+            }
+        }
+        text.push(b'\n');
+    }
+    text
+}
+
+// Blocks of rows are formatted on worker threads and written in order
+fn write_csv<W: Write>(batch: &RecordBatch, out: &mut W) -> PyResult<()> {
+    let schema = batch.schema();
+    let names: Vec<&str> = schema.fields().iter().map(|field| field.name().as_str()).collect();
+    writeln!(out, "{}", names.join(","))?;
+
+    let columns = batch
+        .columns()
+        .iter()
+        .map(|column| match column.data_type() {
+            DataType::Float64 => Ok(CsvColumn::F64(&column.as_primitive::<Float64Type>().values()[..])),
+            DataType::UInt64 => Ok(CsvColumn::U64(&column.as_primitive::<UInt64Type>().values()[..])),
+            other => Err(PyValueError::new_err(format!("cannot write {} columns to CSV", other))),
+        })
+        .collect::<PyResult<Vec<_>>>()?;
+
+    let rows = batch.num_rows();
+    let blocks: Vec<_> = (0..rows)
+        .step_by(CSV_BLOCK_ROWS)
+        .map(|start| start..(start + CSV_BLOCK_ROWS).min(rows))
+        .collect();
+    let n_threads = std::thread::available_parallelism().map(|n| n.get()).unwrap_or(1);
+    for wave in blocks.chunks(n_threads) {
+        let texts: Vec<Vec<u8>> = std::thread::scope(|scope| {
+            let handles: Vec<_> = wave
+                .iter()
+                .map(|block| {
+                    let columns = &columns;
+                    scope.spawn(move || format_csv_rows(columns, block.clone()))
+                })
+                .collect();
+            handles.into_iter().map(|handle| handle.join().expect("CSV formatting thread panicked")).collect()
+        });
+        for text in texts {
+            out.write_all(&text)?;
+        }
+    }
+    Ok(())
+}
+
+// First interval where the accumulated frequency reaches half of the sample
+fn median_interval(si: &[f64], total_n: f64) -> Option<usize> {
+    if total_n > 0.0 {
+        si.iter().position(|&s| s >= total_n / 2.0)
+    } else {
+        None
+    }
+}
+
+// Interval with the largest frequency, the first one on ties
+fn modal_interval(ni: &[f64]) -> Option<usize> {
+    let mut best: Option<usize> = None;
+    for (i, &n) in ni.iter().enumerate() {
+        if n > 0.0 && best.map_or(true, |b| n > ni[b]) {
+            best = Some(i);
+        }
+    }
+    best
+}
+
+// Concatenates one per-interval column of every result
+fn gather_interval_column(results: &[&GroupStatsResult], rows: usize, column: impl Fn(&GroupStatsResult) -> &[f64]) -> ArrayRef {
+    let mut values = Vec::with_capacity(rows);
+    for result in results {
+        values.extend_from_slice(column(result));
+    }
+    f64_column(values)
+}
+
+fn group_stats_table(results: &[&GroupStatsResult], table: &str, with_index: bool) -> PyResult<RecordBatch> {
+    let mut columns: Vec<(&'static str, ArrayRef)> = Vec::new();
+
+    match table {
+        "intervals" => {
+            let rows: usize = results.iter().map(|r| r.intervals.len()).sum();
+            let mut result_index = Vec::with_capacity(rows);
+            let mut interval_index = Vec::with_capacity(rows);
+            let mut starts = Vec::with_capacity(rows);
+            let mut ends = Vec::with_capacity(rows);
+            let mut wi = Vec::with_capacity(rows);
+            for (r, result) in results.iter().enumerate() {
+                for (i, &(start, end)) in result.intervals.iter().enumerate() {
+                    result_index.push(r as u64);
+                    interval_index.push(i as u64);
+                    starts.push(start);
+                    ends.push(end);
+                    wi.push(if result.sum_ni > 0.0 { result.ni[i] / result.sum_ni } else { 0.0 });
+                }
+            }
+
+            if with_index {
+                columns.push(("result", u64_column(result_index)));
+            }
+            columns.push(("interval", u64_column(interval_index)));
+            columns.push(("interval_start", f64_column(starts)));
+            columns.push(("interval_end", f64_column(ends)));
+            columns.push(("xi", gather_interval_column(results, rows, |r| &r.xi)));
+            columns.push(("ni", gather_interval_column(results, rows, |r| &r.ni)));
+            columns.push(("si", gather_interval_column(results, rows, |r| &r.si)));
+            columns.push(("wi", f64_column(wi)));
+            columns.push(("xi_ni", gather_interval_column(results, rows, |r| &r.xi_ni)));
+            columns.push(("xi_minus_mean", gather_interval_column(results, rows, |r| &r.xi_minus_mean)));
+            columns.push(("abs_xi_minus_mean_ni", gather_interval_column(results, rows, |r| &r.abs_xi_minus_mean_ni)));
+            columns.push(("squared_xi_minus_mean_ni", gather_interval_column(results, rows, |r| &r.squared_xi_minus_mean_ni)));
+            columns.push(("cubed_xi_minus_mean_ni", gather_interval_column(results, rows, |r| &r.cubed_xi_minus_mean_ni)));
+            columns.push(("fourth_power_xi_minus_mean_ni", gather_interval_column(results, rows, |r| &r.fourth_power_xi_minus_mean_ni)));
+        }
+        "summary" => {
+            let scalar = |value: fn(&GroupStatsResult) -> f64| f64_column(results.iter().map(|r| value(r)).collect());
+
+            if with_index {
+                columns.push(("result", u64_column((0..results.len() as u64).collect())));
+            }
+            columns.push(("sum_ni", scalar(|r| r.sum_ni)));
+            columns.push(("sum_xi_ni", scalar(|r| r.sum_xi_ni)));
+            columns.push(("sum_abs", scalar(|r| r.sum_abs)));
+            columns.push(("sum_squared", scalar(|r| r.sum_squared)));
+            columns.push(("sum_cubed", scalar(|r| r.sum_cubed)));
+            columns.push(("sum_fourth", scalar(|r| r.sum_fourth)));
+            columns.push(("mean", scalar(|r| r.mean)));
+            columns.push(("variance", scalar(|r| r.variance)));
+            columns.push(("std", scalar(|r| r.std)));
+            columns.push(("mean_linear_dev", scalar(|r| r.mean_linear_dev)));
+            columns.push(("variation_coef", scalar(|r| r.variation_coef)));
+            columns.push(("asymmetry", scalar(|r| r.asymmetry)));
+            columns.push(("excess", scalar(|r| r.excess)));
+            // medians and modes hold one candidate per interval, the summary
+            // takes the median interval's and the modal interval's
+            columns.push(("median", scalar(|r| median_interval(&r.si, r.sum_ni).map_or(f64::NAN, |i| r.medians[i]))));
+            columns.push(("mode", scalar(|r| modal_interval(&r.ni).map_or(f64::NAN, |i| r.modes[i]))));
+        }
+        _ => {
+            return Err(PyValueError::new_err(format!(
+                "unknown table '{}', expected 'intervals' or 'summary'",
+                table
+            )))
+        }
+    }
+    record_batch(columns)
+}
+
+fn rolling_table(result: &RollingStatsResult, table: &str) -> PyResult<RecordBatch> {
+    let mut columns: Vec<(&'static str, ArrayRef)> = Vec::new();
+
+    match table {
+        "summary" => {
+            columns.push(("window_start", u64_column(result.window_start.iter().map(|&i| i as u64).collect())));
+            columns.push(("window_end", u64_column(result.window_end.iter().map(|&i| i as u64).collect())));
+            // Only time-based windows have end times
+            if !result.window_end_time.is_empty() {
+                columns.push(("window_end_time", f64_column(result.window_end_time.clone())));
+            }
+            columns.push(("count", f64_column(result.count.clone())));
+            columns.push(("mean", f64_column(result.mean.clone())));
+            columns.push(("variance", f64_column(result.variance.clone())));
+            columns.push(("std", f64_column(result.std.clone())));
+            columns.push(("mean_linear_dev", f64_column(result.mean_linear_dev.clone())));
+            columns.push(("variation_coef", f64_column(result.variation_coef.clone())));
+            columns.push(("asymmetry", f64_column(result.asymmetry.clone())));
+            columns.push(("excess", f64_column(result.excess.clone())));
+        }
+        "histogram" => {
+            let k = result.intervals.len();
+            let rows = if k == 0 { 0 } else { result.histogram.len() };
+            let mut window_index = Vec::with_capacity(rows);
+            let mut interval_index = Vec::with_capacity(rows);
+            let mut starts = Vec::with_capacity(rows);
+            let mut ends = Vec::with_capacity(rows);
+            for row in 0..rows {
+                let (start, end) = result.intervals[row % k];
+                window_index.push((row / k) as u64);
+                interval_index.push((row % k) as u64);
+                starts.push(start);
+                ends.push(end);
+            }
+
+            columns.push(("window", u64_column(window_index)));
+            columns.push(("interval", u64_column(interval_index)));
+            columns.push(("interval_start", f64_column(starts)));
+            columns.push(("interval_end", f64_column(ends)));
+            columns.push(("ni", f64_column(result.histogram[..rows].to_vec())));
+        }
+        _ => {
+            return Err(PyValueError::new_err(format!(
+                "unknown table '{}', expected 'summary' or 'histogram'",
+                table
+            )))
+        }
+    }
+    record_batch(columns)
+}
+
+/// Writes many `GroupStatsResult` objects to one file.
+///
+/// Same tables as `GroupStatsResult.export`, with a leading `result`
+/// column holding the position of each result in `results`.
+#[pyfunction]
+#[pyo3(signature = (results, path, format=None, table="intervals"))]
+fn export_group_stats(
+    py: Python<'_>,
+    results: Vec<PyRef<'_, GroupStatsResult>>,
+    path: &str,
+    format: Option<&str>,
+    table: &str,
+) -> PyResult<()> {
+    let format = ExportFormat::resolve(path, format)?;
+    let results: Vec<&GroupStatsResult> = results.iter().map(|r| &**r).collect();
+    let batch = group_stats_table(&results, table, true)?;
+    py.detach(|| write_record_batch(&batch, path, format))
+}
+
+/// Kernel set used for min/max and binning: `"avx2"` or `"scalar"`.
+///
+/// Chosen once per process from the CPU features; `RUST_STATS_SIMD=off`
+/// forces `"scalar"`.
+#[pyfunction]
+fn simd_backend() -> &'static str {
+    if avx2_enabled() {
+        "avx2"
+    } else {
+        "scalar"
+    }
+}
+
+#[pymodule]
+fn rust_stats(m: &Bound<'_, PyModule>) -> PyResult<()> {
+    m.add_class::<GroupStatsResult>()?;
+    m.add_function(wrap_pyfunction!(group_stats, m)?)?;
+    m.add_function(wrap_pyfunction!(group_stats_from_frequencies, m)?)?;
+    m.add_class::<RollingStatsResult>()?;
+    m.add_function(wrap_pyfunction!(rolling_stats, m)?)?;
+    m.add_function(wrap_pyfunction!(rolling_stats_by_time, m)?)?;
+    m.add_class::<BootstrapResult>()?;
+    m.add_function(wrap_pyfunction!(bootstrap_group_stats, m)?)?;
+    m.add_class::<GoodnessOfFitResult>()?;
+    m.add_function(wrap_pyfunction!(goodness_of_fit, m)?)?;
+    m.add_function(wrap_pyfunction!(goodness_of_fit_binned, m)?)?;
+    m.add_class::<ComparisonResult>()?;
+    m.add_function(wrap_pyfunction!(compare_samples, m)?)?;
+    m.add_class::<CompactSample>()?;
+    m.add_function(wrap_pyfunction!(export_group_stats, m)?)?;
+    m.add_function(wrap_pyfunction!(simd_backend, m)?)?;
+    Ok(())
+}
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    // Deterministic pseudo-normal sample (sum of uniforms)
+    fn sample(n: usize, seed: u64) -> Vec<f64> {
+        let mut rng = Xoshiro256::seed_from(seed);
+        (0..n)
+            .map(|_| (0..12).map(|_| (rng.next_u64() >> 11) as f64 / (1u64 << 53) as f64).sum::<f64>() * 10.0 + 40.0)
+            .collect()
+    }
+
+    // Linear search used before the vectorized binning: half-open intervals,
+    // the last one closed
+    fn find_interval_reference(value: f64, intervals: &[(f64, f64)]) -> Option<usize> {
+        let last_index = intervals.len() - 1;
+        for (i, &(start, end)) in intervals.iter().enumerate() {
+            if (i != last_index && value >= start && value < end) ||
+               (i == last_index && value >= start && value <= end) {
+                return Some(i);
+            }
+        }
+        for (i, &(start, end)) in intervals.iter().enumerate() {
+            if value >= start && value <= end {
+                return Some(i);
+            }
+        }
+        None
+    }
+
+    fn count_reference(data: &[f64], weights: Option<&[f64]>, intervals: &[(f64, f64)]) -> Vec<f64> {
+        let mut freqs = vec![0.0; intervals.len()];
+        for (j, &value) in data.iter().enumerate() {
+            let weight = weights.map_or(1.0, |w| w[j]);
+            if weight == 0.0 {
+                continue;
+            }
+            if let Some(i) = find_interval_reference(value, intervals) {
+                freqs[i] += weight;
+            }
+        }
+        freqs
+    }
+
+    fn avx2_available() -> bool {
+        #[cfg(target_arch = "x86_64")]
+        {
+            std::arch::is_x86_feature_detected!("avx2")
+        }
+        #[cfg(not(target_arch = "x86_64"))]
+        {
+            false
+        }
+    }
+
+    // Scalar path always, AVX2 path when the CPU has it
+    fn kernel_paths() -> Vec<bool> {
+        if avx2_available() {
+            vec![false, true]
+        } else {
+            vec![false]
+        }
+    }
+
+    #[test]
+    fn binning_matches_linear_search() {
+        let mut data = sample(10_001, 1);
+        data.extend([f64::NAN, f64::INFINITY, f64::NEG_INFINITY, -1e300, 1e300]);
+
+        for k in [1, 2, 3, 7, 17, 40] {
+            for (min_val, max_val) in [(20.0, 110.0), (55.0, 65.0), (60.0, 60.0), (0.1, 0.7)] {
+                let intervals = compute_intervals(min_val, max_val, k);
+                // Every boundary and the maximum itself, with their neighbours
+                let mut values = data.clone();
+                for &(start, end) in &intervals {
+                    values.extend([start, end, start.next_down(), end.next_up()]);
+                }
+                let weights: Vec<f64> = (0..values.len()).map(|i| (i % 3) as f64 * 0.5).collect();
+
+                let expected = count_reference(&values, None, &intervals);
+                let expected_weighted = count_reference(&values, Some(&weights), &intervals);
+                for use_avx2 in kernel_paths() {
+                    assert_eq!(count_frequencies_using(&values, None, &intervals, use_avx2), expected,
+                               "k={k} range=({min_val}, {max_val}) avx2={use_avx2}");
+                    assert_eq!(count_frequencies_using(&values, Some(&weights), &intervals, use_avx2), expected_weighted,
+                               "weighted k={k} range=({min_val}, {max_val}) avx2={use_avx2}");
+                }
+            }
+        }
+    }
+
+    #[test]
+    fn maximum_goes_to_last_interval_and_nan_is_skipped() {
+        let intervals = compute_intervals(0.0, 10.0, 5);
+        let data = [0.0, 2.0, 4.0, 10.0, f64::NAN, 10.5];
+        for use_avx2 in kernel_paths() {
+            assert_eq!(count_frequencies_using(&data, None, &intervals, use_avx2), vec![1.0, 1.0, 1.0, 0.0, 1.0]);
+        }
+        assert_eq!(bin_index(10.0, &intervals), Some(4));
+        assert_eq!(bin_index(2.0, &intervals), Some(1));
+        assert_eq!(bin_index(f64::NAN, &intervals), None);
+    }
+
+    #[test]
+    fn min_max_matches_fold() {
+        let mut data = sample(1_003, 2);
+        data[5] = f64::NAN;
+        data[700] = f64::NAN;
+        let expected = (
+            data.iter().fold(f64::INFINITY, |acc, &x| acc.min(x)),
+            data.iter().fold(f64::NEG_INFINITY, |acc, &x| acc.max(x)),
+        );
+        for use_avx2 in kernel_paths() {
+            for len in [0, 1, 3, 8, 9, data.len()] {
+                let part = &data[..len];
+                let fold = (
+                    part.iter().fold(f64::INFINITY, |acc, &x| acc.min(x)),
+                    part.iter().fold(f64::NEG_INFINITY, |acc, &x| acc.max(x)),
+                );
+                assert_eq!(min_max_using(part, use_avx2), fold);
+            }
+            assert_eq!(min_max_using(&data, use_avx2), expected);
+        }
+    }
+
+    #[test]
+    fn deviation_powers_match_powi() {
+        let xi_minus_mean: Vec<f64> = (0..23).map(|i| i as f64 * 0.7 - 5.0).collect();
+        let ni: Vec<f64> = (0..23).map(|i| ((i * 7) % 5) as f64).collect();
+        let powers = compute_deviation_powers(&xi_minus_mean, &ni);
+        let columns = [&powers.abs, &powers.squared, &powers.cubed, &powers.fourth];
+
+        for (p, column) in columns.iter().enumerate() {
+            let expected: Vec<f64> = xi_minus_mean.iter().zip(&ni)
+                .map(|(&d, &n)| if p == 0 { d.abs() * n } else { d.powi(p as i32 + 1) * n })
+                .collect();
+            for (a, b) in column.iter().zip(&expected) {
+                assert!((a - b).abs() <= 1e-9 * b.abs().max(1.0));
+            }
+            let sum: f64 = expected.iter().sum();
+            assert!((powers.sums[p] - sum).abs() <= 1e-9 * sum.abs().max(1.0));
+        }
+    }
+
+    #[test]
+    fn stepped_time_windows_include_first_timestamp() {
+        let timestamps: Vec<f64> = (0..=10).map(|t| t as f64).collect();
+        let (windows, ends) = time_windows(&timestamps, 5.0, Some(5.0));
+        assert_eq!(ends, vec![0.0, 5.0, 10.0]);
+        assert_eq!(windows, vec![(0, 1), (1, 6), (6, 11)]);
+
+        // Rows sharing the first timestamp are all counted
+        let (windows, _) = time_windows(&[3.0, 3.0, 4.0, 9.0], 2.0, Some(2.0));
+        assert_eq!(windows, vec![(0, 2), (2, 3), (3, 3), (3, 4)]);
+    }
+
+    fn allocation_count() -> u64 {
+        ALLOCATIONS.with(|c| c.get())
+    }
+
+    #[test]
+    fn allocations_are_counted_only_while_profiling() {
+        let before = allocation_count();
+        let _ = std::hint::black_box(vec![0u8; 64]);
+        assert_eq!(allocation_count(), before);
+
+        let mut profiler = Profiler::new(true);
+        let _ = std::hint::black_box(vec![0u8; 64]);
+        profiler.phase("allocate");
+        let timings = profiler.finish();
+        assert!(timings[0].2 >= 1 && timings[0].3 >= 64);
+
+        let after = allocation_count();
+        let _ = std::hint::black_box(vec![0u8; 64]);
+        assert_eq!(allocation_count(), after);
+    }
+
+    #[test]
+    fn ks_statistic_counts_upper_tail() {
+        // Left-skewed sample on one interval: the fitted normal puts about 31%
+        // of its mass above the maximum and about 2% below the minimum
+        let sample = [0.0, 1.0, 1.0, 1.0, 1.0];
+        let intervals = compute_intervals(0.0, 1.0, 1);
+        let (dist, _) = FittedDistribution::fit("normal", &sample, None).unwrap();
+        let upper_tail = 1.0 - dist.cdf(1.0);
+        assert!(upper_tail > 10.0 * dist.cdf(0.0));
+
+        let result = compute_goodness_of_fit(&intervals, &[5.0], "normal", Some((&sample, None))).unwrap();
+        assert_eq!(result.ks_statistic, upper_tail);
+        // Parameters come from the same sample, no calibrated p-value exists
+        assert!(result.ks_p_value().is_nan());
+        assert!(result.ad_critical_values().iter().all(|c| c.is_nan()));
+    }
+
+    #[test]
+    fn all_nan_rolling_histogram_has_a_row_per_window() {
+        let data = [f64::NAN; 10];
+        let result = compute_rolling(&data, &count_windows(data.len(), 4, 2), None);
+        assert!(result.intervals.is_empty());
+        assert_eq!(result.histogram().len(), result.mean.len());
+        assert!(result.histogram().iter().all(|row| row.is_empty()));
+    }
+
+    #[test]
+    fn fractional_weights_use_effective_sample_size() {
+        let data = [1.0, 2.0, 3.0];
+        assert_eq!(effective_sample_size(3, Some(&[2.0, 1.0, 3.0])), 6);
+        // (0.2 + 0.3 + 0.5)² / (0.04 + 0.09 + 0.25) ≈ 2.6
+        assert_eq!(effective_sample_size(3, Some(&[0.2, 0.3, 0.5])), 3);
+
+        let normalised = compute_group_stats(&data, Some(&[0.2, 0.3, 0.5]), &mut Profiler::disabled());
+        let rescaled = compute_group_stats(&data, Some(&[2.5, 3.75, 6.25]), &mut Profiler::disabled());
+        assert_eq!(normalised.intervals.len(), 3);
+        assert!(normalised.variance > 0.0);
+        assert_eq!(normalised.intervals, rescaled.intervals);
+        assert!((normalised.asymmetry - rescaled.asymmetry).abs() < 1e-12);
+    }
+
+    #[test]
+    fn summary_median_and_mode_come_from_their_intervals() {
+        let intervals = compute_intervals(0.0, 10.0, 5);
+        let ni = vec![1.0, 2.0, 6.0, 3.0, 0.0];
+        let result = build_group_stats(intervals, ni, &mut Profiler::disabled());
+        assert_eq!(median_interval(&result.si, result.sum_ni), Some(2));
+        assert_eq!(modal_interval(&result.ni), Some(2));
+        assert_eq!(median_interval(&[0.0], 0.0), None);
+        assert_eq!(modal_interval(&[0.0, 0.0]), None);
+
+        // Median: 4 + (6 - 3) / 6 * 2 = 5; mode: 4 + 4 / (4 + 3) * 2
+        assert!((result.medians[2] - 5.0).abs() < 1e-12);
+        assert!((result.modes[2] - (4.0 + 8.0 / 7.0)).abs() < 1e-12);
+    }
+
+    #[test]
+    fn compact_kernels_match_reference() {
+        let data = sample(10_003, 5);
+        let mut floats: Vec<f32> = data.iter().map(|&x| x as f32).collect();
+        floats[17] = f32::NAN;
+        let scaled = scale_to_i32(&data, 3).unwrap();
+        let (min_val, max_val) = (floats[0] as f64, floats[1] as f64);
+        let intervals = compute_intervals(min_val.min(max_val), min_val.max(max_val), 9);
+        // The scaled grid always spans the stored values, as in compute_compact_group_stats
+        let (scaled_min, scaled_max) = (scaled.iter().min().unwrap(), scaled.iter().max().unwrap());
+        let scaled_intervals = compute_intervals(*scaled_min as f64 / 1000.0, *scaled_max as f64 / 1000.0, 9);
+
+        let f32_reference: Vec<f64> = {
+            let widened: Vec<f64> = floats.iter().map(|&x| x as f64).collect();
+            count_reference(&widened, None, &intervals)
+        };
+        let scaled_reference: Vec<f64> = {
+            let decoded: Vec<f64> = scaled.iter().map(|&v| v as f64 / 1000.0).collect();
+            count_reference(&decoded, None, &scaled_intervals)
+        };
+        for use_avx2 in kernel_paths() {
+            for len in [0, 1, 9, 17, floats.len()] {
+                let part = &floats[..len];
+                let fold = (
+                    part.iter().fold(f32::INFINITY, |acc, &x| acc.min(x)),
+                    part.iter().fold(f32::NEG_INFINITY, |acc, &x| acc.max(x)),
+                );
+                assert_eq!(min_max_f32(part, use_avx2), fold);
+                let part = &scaled[..len];
+                let fold = (part.iter().copied().fold(i32::MAX, i32::min), part.iter().copied().fold(i32::MIN, i32::max));
+                assert_eq!(min_max_i32(part, use_avx2), fold);
+            }
+            assert_eq!(count_frequencies_f32(&floats, &intervals, use_avx2), f32_reference);
+            assert_eq!(count_frequencies_scaled(&scaled, 3, &scaled_intervals, use_avx2), scaled_reference);
+        }
+    }
+
+    #[test]
+    fn compact_scaled_matches_group_stats() {
+        let data: Vec<f64> = sample(5_000, 3).iter().map(|x| (x * 10.0).round() / 10.0).collect();
+        let values = scale_to_i32(&data, 1).unwrap();
+        let compact = CompactValues::Scaled { values: values.clone(), decimals: 1 };
+        let decoded: Vec<f64> = values.iter().map(|&v| v as f64 / 10.0).collect();
+
+        let expected = compute_group_stats(&decoded, None, &mut Profiler::disabled());
+        let result = compute_compact_group_stats(&compact, &mut Profiler::disabled());
+        assert_eq!(result.intervals, expected.intervals);
+        assert_eq!(result.ni, expected.ni);
+        assert_eq!(result.mean, expected.mean);
+        assert_eq!(result.variance, expected.variance);
+        assert_eq!(result.asymmetry, expected.asymmetry);
+        assert_eq!(result.excess, expected.excess);
+        assert_eq!(result.medians, expected.medians);
+        assert_eq!(result.modes, expected.modes);
+    }
+
+    // Parses a CSV written by write_csv back into columns of the batch types
+    fn read_csv(path: &Path, like: &RecordBatch) -> (Vec<String>, Vec<ArrayRef>) {
+        let text = std::fs::read_to_string(path).unwrap();
+        let mut lines = text.lines();
+        let names = lines.next().unwrap().split(',').map(String::from).collect();
+        let rows: Vec<Vec<&str>> = lines.map(|line| line.split(',').collect()).collect();
+        let columns = like
+            .columns()
+            .iter()
+            .enumerate()
+            .map(|(j, column)| match column.data_type() {
+                DataType::Float64 => f64_column(rows.iter().map(|row| row[j].parse().unwrap()).collect()),
+                _ => u64_column(rows.iter().map(|row| row[j].parse().unwrap()).collect()),
+            })
+            .collect();
+        (names, columns)
+    }
+
+    #[test]
+    fn exported_files_read_back() {
+        use arrow_ipc::reader::FileReader;
+        use parquet::arrow::arrow_reader::ParquetRecordBatchReaderBuilder;
+
+        let data = sample(5_000, 23);
+        let result = compute_group_stats(&data, None, &mut Profiler::disabled());
+        let dir = std::env::temp_dir().join(format!("rust_stats_export_{}", std::process::id()));
+        std::fs::create_dir_all(&dir).unwrap();
+
+        for table in ["intervals", "summary"] {
+            let batch = group_stats_table(&[&result, &result], table, true).unwrap();
+            let schema = batch.schema();
+            let names: Vec<String> = schema.fields().iter().map(|field| field.name().clone()).collect();
+            let types: Vec<DataType> = schema.fields().iter().map(|field| field.data_type().clone()).collect();
+
+            for (extension, format) in [("csv", ExportFormat::Csv), ("arrow", ExportFormat::ArrowIpc), ("parquet", ExportFormat::Parquet)] {
+                let path = dir.join(format!("{}.{}", table, extension));
+                write_record_batch(&batch, path.to_str().unwrap(), format).unwrap();
+
+                let (read_names, read_columns) = match format {
+                    ExportFormat::Csv => read_csv(&path, &batch),
+                    ExportFormat::ArrowIpc | ExportFormat::Parquet => {
+                        let batches: Vec<RecordBatch> = match format {
+                            ExportFormat::ArrowIpc => FileReader::try_new(File::open(&path).unwrap(), None)
+                                .unwrap()
+                                .collect::<Result<_, _>>()
+                                .unwrap(),
+                            _ => ParquetRecordBatchReaderBuilder::try_new(File::open(&path).unwrap())
+                                .unwrap()
+                                .build()
+                                .unwrap()
+                                .collect::<Result<_, _>>()
+                                .unwrap(),
+                        };
+                        assert_eq!(batches.len(), 1, "{} {}", table, extension);
+                        let read_schema = batches[0].schema();
+                        let read_types: Vec<DataType> = read_schema.fields().iter().map(|field| field.data_type().clone()).collect();
+                        assert_eq!(read_types, types, "{} {}", table, extension);
+                        let read_names = read_schema.fields().iter().map(|field| field.name().clone()).collect();
+                        (read_names, batches[0].columns().to_vec())
+                    }
+                };
+                assert_eq!(read_names, names, "{} {}", table, extension);
+                assert_eq!(read_columns, batch.columns().to_vec(), "{} {}", table, extension);
+            }
+        }
+        std::fs::remove_dir_all(&dir).unwrap();
+    }
+}
@@ -0,0 +1,74 @@
+"""Бенчмарк векторизованных ядер rust_stats (min/max и разбиение на интервалы).
+
+Запускает group_stats с профилированием в двух процессах: с ядрами,
+выбранными по возможностям CPU (AVX2), и с RUST_STATS_SIMD=off (скалярные),
+и печатает время фаз и ускорение.
+
+Пример:
+    python statistics_app/benchmark.py --sizes 100000 1000000 10000000 --repeat 7
+"""
+import argparse
+import array
+import json
+import os
+import random
+import subprocess
+import sys
+
+from rust_stats import group_stats, simd_backend
+
+PHASES = ("compute_intervals", "count_frequencies")
+
+
+def measure(sizes, repeat, seed):
+    """Лучшее из repeat время каждой фазы для каждого размера выборки"""
+    rng = random.Random(seed)
+    results = {"backend": simd_backend(), "sizes": {}}
+    for n in sizes:
+        # array('d') передается в Rust через буфер, без преобразования списка
+        data = array.array("d", (rng.gauss(100, 15) for _ in range(n)))
+        best = {}
+        for _ in range(repeat):
+            timings = group_stats(data, profile=True).timings
+            total = sum(seconds for _, seconds, _, _ in timings)
+            for name, seconds in [(name, seconds) for name, seconds, _, _ in timings] + [("total", total)]:
+                best[name] = min(best.get(name, float("inf")), seconds)
+        results["sizes"][str(n)] = best
+    return results
+
+
+def run_child(args, simd):
+    """Повторяет измерение в отдельном процессе: выбор ядер фиксируется при первом вызове"""
+    env = dict(os.environ, RUST_STATS_SIMD=simd)
+    command = [sys.executable, __file__, "--child", "--repeat", str(args.repeat),
+               "--seed", str(args.seed), "--sizes", *map(str, args.sizes)]
+    output = subprocess.run(command, env=env, check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк SIMD-ядер rust_stats")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000, 10_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.sizes, args.repeat, args.seed)))
+        return
+
+    vectorized = run_child(args, "on")
+    scalar = run_child(args, "off")
+    print(f"Ядра: {vectorized['backend']} против {scalar['backend']}")
+    for n in map(str, args.sizes):
+        print(f"\nn = {n}")
+        for phase in PHASES + ("total",):
+            fast = vectorized["sizes"][n][phase]
+            slow = scalar["sizes"][n][phase]
+            speedup = slow / fast if fast > 0 else float("inf")
+            print(f"  {phase:<18} {slow * 1000:9.3f} мс -> {fast * 1000:9.3f} мс  (x{speedup:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Нагрузочный тест локального сервиса статистики (service.py).
+
+Пример:
+    python statistics_app/load_test.py --requests 2000 --concurrency 32 --size 100000 --binary
+"""
+import argparse
+import array
+import asyncio
+import json
+import random
+import time
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def send_request(reader, writer, host, path, body, content_type):
+    """Отправляет один запрос по открытому соединению и читает ответ"""
+    writer.write((
+        f"POST {path} HTTP/1.1\r\n"
+        f"Host: {host}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n"
+    ).encode("latin-1") + body)
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def worker(args, payloads, counter, latencies, errors):
+    """Одно keep-alive соединение, отправляющее запросы подряд"""
+    reader, writer = await asyncio.open_connection(args.host, args.port)
+    try:
+        while counter[0] < args.requests:
+            path, body, content_type = payloads[counter[0] % len(payloads)]
+            counter[0] += 1
+            started = time.perf_counter()
+            status = await send_request(reader, writer, args.host, path, body, content_type)
+            latencies.append(time.perf_counter() - started)
+            if status != 200:
+                errors[0] += 1
+    finally:
+        writer.close()
+
+
+def build_payloads(args):
+    """Готовит набор тел запросов; различные выборки обходят кэш сервиса"""
+    payloads = []
+    rng = random.Random(args.seed)
+    for _ in range(args.distinct):
+        data = [rng.gauss(100, 15) for _ in range(args.size)]
+        path = f"/{args.endpoint}"
+        if args.binary:
+            if args.endpoint == "compare":
+                reference = [rng.gauss(100, 15) for _ in range(args.size)]
+                path += f"?split={len(data)}"
+                data = data + reference
+            payloads.append((path, array.array("d", data).tobytes(), "application/octet-stream"))
+        else:
+            if args.endpoint == "compare":
+                body = {"current": data, "reference": [rng.gauss(100, 15) for _ in range(args.size)]}
+            else:
+                body = {"data": data}
+            payloads.append((path, json.dumps(body).encode(), "application/json"))
+    return payloads
+
+
+async def run(args):
+    payloads = build_payloads(args)
+    counter, errors, latencies = [0], [0], []
+
+    started = time.perf_counter()
+    await asyncio.gather(*[
+        worker(args, payloads, counter, latencies, errors)
+        for _ in range(args.concurrency)
+    ])
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(f"Запросов: {len(latencies)}, ошибок: {errors[0]}, время: {elapsed:.2f} с")
+    print(f"Пропускная способность: {len(latencies) / elapsed:.1f} запросов/с")
+    for p in (50, 90, 99):
+        print(f"p{p}: {percentile(latencies, p) * 1000:.2f} мс")
+    print(f"max: {latencies[-1] * 1000:.2f} мс" if latencies else "max: -")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Нагрузочный тест сервиса статистики")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--endpoint", default="group_stats",
+                        choices=["group_stats", "quantiles", "compare"])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--size", type=int, default=10000, help="размер выборки в запросе")
+    parser.add_argument("--distinct", type=int, default=8,
+                        help="число различных выборок (повторы попадают в кэш сервиса)")
+    parser.add_argument("--binary", action="store_true",
+                        help="передавать данные как float64 (application/octet-stream)")
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,48 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 import re
 import random
+import json
+import time
+import logging
+import os
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
 
+logger = logging.getLogger("statistics_app")
+
 try:
-    from rust_stats import group_stats
+    from rust_stats import group_stats, bootstrap_group_stats, compare_samples
     RUST_AVAILABLE = True
-    print("✅ Rust модуль доступен")
 except ImportError:
     RUST_AVAILABLE = False
-    print("⚠️ Rust модуль не найден, будет использоваться Python версия")
     # Резервная Python реализация (обновленная для совместимости)
 
+# Поля GroupStatsResult, читаемые интерфейсом
+RESULT_FIELDS = (
+    "intervals", "ni", "xi", "si", "xi_ni", "xi_minus_mean",
+    "abs_xi_minus_mean_ni", "squared_xi_minus_mean_ni",
+    "cubed_xi_minus_mean_ni", "fourth_power_xi_minus_mean_ni",
+    "medians", "modes",
+)
+
 class StatisticsApp:
     def __init__(self, root):
         self.root = root
         self.root.title("Статистический анализатор")
         self.root.geometry("1600x900")
         
+        # Логируется здесь, а не при импорте: к этому моменту logging уже настроен
+        if RUST_AVAILABLE:
+            logger.info("✅ Rust модуль доступен")
+        else:
+            logger.warning("⚠️ Rust модуль не найден, будет использоваться Python версия")
+        
         self.data = []
+        self.reference_data = []
         self.current_result = None
+        self.last_profile = None
         
         self.create_layout()
         
@@ -115,6 +135,53 @@ class StatisticsApp:
         )
         self.median_mode_button.pack(pady=5)
         
+        # Кнопка для доверительных интервалов (бутстреп)
+        self.bootstrap_button = ttk.Button(
+            self.left_panel,
+            text="Доверительные интервалы",
+            width=20,
+            command=self.show_bootstrap_intervals
+        )
+        self.bootstrap_button.pack(pady=5)
+        
+        # Сравнение с эталонной выборкой (например, с прошлой неделей)
+        ttk.Button(
+            self.left_panel,
+            text="Запомнить как эталон",
+            width=20,
+            command=self.save_reference
+        ).pack(pady=5)
+        
+        ttk.Button(
+            self.left_panel,
+            text="Сравнить с эталоном",
+            width=20,
+            command=self.compare_with_reference
+        ).pack(pady=5)
+        
+        # Экспорт таблицы интервалов и итоговых статистик в файл
+        ttk.Button(
+            self.left_panel,
+            text="Экспорт результатов",
+            width=20,
+            command=self.export_results
+        ).pack(pady=5)
+        
+        # Профилирование расчета
+        self.profile_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            self.left_panel,
+            text="Профилирование",
+            variable=self.profile_var
+        ).pack(pady=5)
+        
+        ttk.Button(
+            self.left_panel,
+            text="Профиль расчета",
+            width=20,
+            command=self.show_profile
+        ).pack(pady=5)
+        
         # 4. Статус Rust
         ttk.Separator(self.left_panel, orient='horizontal').pack(fill=tk.X, pady=10)
         
@@ -469,20 +536,32 @@ class StatisticsApp:
                 messagebox.showwarning("Нет данных", "Введите данные для анализа")
                 return
             
+            profile = self.profile_var.get()
+            phases = []
+            
             # Вызываем Rust модуль
-            print(f"📊 Передаем в Rust: {len(self.data)} чисел")
-            result = group_stats(self.data)
+            logger.info(f"📊 Передаем в Rust: {len(self.data)} чисел")
+            started = time.perf_counter()
+            result = group_stats(self.data, profile=profile)
+            phases.append(("group_stats_call", time.perf_counter() - started))
             
             # Сохраняем результат
             self.current_result = result
             
+            if profile:
+                # Стоимость геттеров: каждый возвращает копию вектора из Rust
+                self.timed(phases, "getters", lambda: [getattr(result, name) for name in RESULT_FIELDS])
+            
             # Обновляем все компоненты интерфейса
-            self.update_table_with_results()
-            self.update_stats_with_results()
-            self.update_sums_with_results()
+            self.timed(phases, "tk_table", self.update_table_with_results)
+            self.timed(phases, "tk_stats", self.update_stats_with_results)
+            self.timed(phases, "tk_sums", self.update_sums_with_results)
             
             # Обновляем гистограмму
-            self.update_histogram(result)
+            self.timed(phases, "histogram", lambda: self.update_histogram(result))
+            
+            if profile:
+                self.record_profile(result, phases)
             
             # Обновляем статус
             self.update_status(f"✅ Рассчитано! {len(self.data)} точек")
@@ -496,24 +575,94 @@ class StatisticsApp:
             
         except Exception as e:
             messagebox.showerror("Ошибка расчета", f"Ошибка: {str(e)}")
-            print(f"❌ Ошибка: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"❌ Ошибка: {e}")
             
+    def timed(self, phases, name, func):
+        """Выполняет func и добавляет (name, секунды) в phases"""
+        started = time.perf_counter()
+        func()
+        phases.append((name, time.perf_counter() - started))
+    
+    def record_profile(self, result, phases):
+        """Собирает профиль расчета (Rust + интерфейс) и пишет его в лог одной записью"""
+        self.last_profile = {
+            "n": len(self.data),
+            "intervals": len(result.intervals),
+            "rust_phases": [
+                {"phase": name, "seconds": seconds, "allocations": allocations, "allocated_bytes": allocated}
+                for name, seconds, allocations, allocated in result.timings
+            ],
+            "python_phases": [
+                {"phase": name, "seconds": seconds} for name, seconds in phases
+            ],
+        }
+        logger.info("profile %s", json.dumps(self.last_profile, ensure_ascii=False))
+    
+    def show_profile(self):
+        """Показывает профиль последнего расчета"""
+        if not self.last_profile:
+            messagebox.showinfo("Нет профиля", 
+                               "Включите 'Профилирование' и выполните расчет")
+            return
+        
+        profile_window = tk.Toplevel(self.root)
+        profile_window.title("Профиль расчета")
+        profile_window.geometry("600x400")
+        
+        profile_tree = ttk.Treeview(profile_window, 
+                                   columns=('phase', 'ms', 'allocations', 'bytes'), 
+                                   show='headings', height=14)
+        
+        profile_tree.heading('phase', text='Этап')
+        profile_tree.heading('ms', text='Время, мс')
+        profile_tree.heading('allocations', text='Аллокаций')
+        profile_tree.heading('bytes', text='Байт')
+        
+        profile_tree.column('phase', width=200)
+        for col in ('ms', 'allocations', 'bytes'):
+            profile_tree.column(col, width=120, anchor='center')
+        
+        for phase in self.last_profile["rust_phases"]:
+            profile_tree.insert('', 'end', 
+                               values=(f"rust: {phase['phase']}", 
+                                       f"{phase['seconds'] * 1000:.3f}", 
+                                       phase['allocations'], 
+                                       phase['allocated_bytes']))
+        for phase in self.last_profile["python_phases"]:
+            profile_tree.insert('', 'end', 
+                               values=(phase['phase'], f"{phase['seconds'] * 1000:.3f}", "", ""))
+        
+        profile_tree.pack(fill='both', expand=True, padx=10, pady=10)
+        
+        def copy_profile():
+            """Копирует профиль в буфер обмена (для приложения к баг-репорту)"""
+            profile_window.clipboard_clear()
+            profile_window.clipboard_append(json.dumps(self.last_profile, ensure_ascii=False, indent=2))
+            self.update_status("📋 Профиль скопирован")
+        
+        button_frame = ttk.Frame(profile_window)
+        button_frame.pack(pady=10)
+        
+        ttk.Button(button_frame, text="📋 Копировать JSON", 
+                  command=copy_profile).pack(side=tk.LEFT, padx=2)
+        
+        ttk.Button(button_frame, text="Закрыть", 
+                  command=profile_window.destroy).pack(side=tk.LEFT, padx=2)
+    
     def update_table_with_results(self):
         """Обновляет таблицу результатами из Rust"""
         if not self.current_result:
-            print("❌ Нет результатов для отображения")
+            logger.error("❌ Нет результатов для отображения")
             return
         
         result = self.current_result
         
         # Проверяем наличие необходимых полей
         if not hasattr(result, 'intervals'):
-            print("❌ У результата нет поля 'intervals'")
+            logger.error("❌ У результата нет поля 'intervals'")
             return
         
-        print(f"🔄 Обновляю таблицу: {len(result.intervals)} строк")
+        logger.info(f"🔄 Обновляю таблицу: {len(result.intervals)} строк")
         
         # 1. Очищаем старые данные
         for item in self.table.get_children():
@@ -533,8 +682,8 @@ class StatisticsApp:
         cubed_xi_minus_mean_ni = result.cubed_xi_minus_mean_ni if hasattr(result, 'cubed_xi_minus_mean_ni') else [0.0] * len(intervals)
         fourth_power_xi_minus_mean_ni = result.fourth_power_xi_minus_mean_ni if hasattr(result, 'fourth_power_xi_minus_mean_ni') else [0.0] * len(intervals)
         
-        # 3. Рассчитываем общее количество данных
-        total_n = len(self.data)
+        # 3. Общий объем выборки (с учетом весов)
+        total_n = result.sum_ni
         
         # 4. Заполняем таблицу новыми данными
         for i in range(len(intervals)):
@@ -556,9 +705,9 @@ class StatisticsApp:
                 # Вставляем строку со ВСЕМИ 12 колонками
                 self.table.insert("", "end", values=(
                     f"[{start:.2f}, {end:.2f}]",    # 1. Интервал
-                    f"{ni[i]}",                      # 2. ni (частота)
+                    f"{ni[i]:g}",                    # 2. ni (частота)
                     f"{xi[i]:.4f}",                  # 3. xi (средняя точка)
-                    f"{si[i]}",                      # 4. si (накопленная частота)
+                    f"{si[i]:g}",                    # 4. si (накопленная частота)
                     f"{xi_ni[i]:.4f}",               # 5. xi·ni
                     f"{wi_value:.4f}",               # 6. wi (относительная частота)
                     f"{pi_value:.2f}%",              # 7. pi, % (процентная частота)
@@ -569,16 +718,16 @@ class StatisticsApp:
                     f"{fourth_dev_val:.4f}"          # 12. (xi-x̄)⁴·ni
                 ))
         
-        print(f"✅ Таблица обновлена: {len(intervals)} строк")
+        logger.info(f"✅ Таблица обновлена: {len(intervals)} строк")
     
     def update_stats_with_results(self):
         """Обновляет статистики результатами из Rust"""
         if not self.current_result:
-            print("❌ Нет результатов для статистик")
+            logger.error("❌ Нет результатов для статистик")
             return
         
         result = self.current_result
-        print("🔄 Обновляю статистики...")
+        logger.info("🔄 Обновляю статистики...")
         
         # Сопоставление ключей статистик с полями из Rust
         stats_mapping = {
@@ -604,20 +753,20 @@ class StatisticsApp:
                 self.stats_labels[key].config(text=value)
                 updated_count += 1
         
-        print(f"✅ Обновлено {updated_count} статистик")
+        logger.info(f"✅ Обновлено {updated_count} статистик")
         
     def update_sums_with_results(self):
         """Обновляет суммы столбцов над таблицей"""
         if not self.current_result:
-            print("❌ Нет результатов для сумм")
+            logger.error("❌ Нет результатов для сумм")
             return
         
         result = self.current_result
-        print("🔄 Обновляю суммы...")
+        logger.info("🔄 Обновляю суммы...")
         
         # Проверяем что self.sum_labels существует
         if not hasattr(self, 'sum_labels') or not self.sum_labels:
-            print("⚠️ sum_labels не инициализированы")
+            logger.warning("⚠️ sum_labels не инициализированы")
             return
         
         # Получаем xi и вычисляем сумму
@@ -630,7 +779,7 @@ class StatisticsApp:
         sums = {
             "ni": f"{result.sum_ni:.0f}",
             "xi": f"{xi_sum:.4f}",
-            "si": f"{si_total}",
+            "si": f"{si_total:g}",
             "xi_ni": f"{result.sum_xi_ni:.4f}",
             "wi": "1.0000",  # Σwi всегда = 1
             "pi": "100.00%", # Σpi всегда = 100%
@@ -644,9 +793,9 @@ class StatisticsApp:
         for col, value in sums.items():
             if col in self.sum_labels:
                 self.sum_labels[col].config(text=value)
-                print(f"  ✅ Σ{col}: {value}")
+                logger.debug(f"  ✅ Σ{col}: {value}")
         
-        print(f"✅ Обновлены суммы")
+        logger.info(f"✅ Обновлены суммы")
     
     def update_histogram(self, result):
         """Обновляет гистограмму с медианами и модами"""
@@ -656,15 +805,15 @@ class StatisticsApp:
                 widget.destroy()
             
             # Проверяем наличие данных
-            if not hasattr(result, 'intervals') or not hasattr(result, 'frequencies'):
-                print("⚠️ Нет данных для гистограммы")
+            if not hasattr(result, 'intervals') or not hasattr(result, 'ni'):
+                logger.warning("⚠️ Нет данных для гистограммы")
                 return
             
             intervals = result.intervals
             frequencies = result.ni if hasattr(result, 'ni') else []
             
             if not intervals or not frequencies:
-                print("⚠️ Пустые данные для гистограммы")
+                logger.warning("⚠️ Пустые данные для гистограммы")
                 return
             
             # Создаем новый график
@@ -674,23 +823,16 @@ class StatisticsApp:
             # Преобразуем интервалы для matplotlib
             bins = [intervals[0][0]] + [upper for (_, upper) in intervals]
             
-            # Создаем данные для гистограммы
-            all_data = []
-            midpoints = []
-            for i, ((start, end)) in enumerate(intervals):
-                if i < len(frequencies):
-                    # Добавляем средние точки интервалов с учетом частоты
-                    midpoint = (start + end) / 2
-                    all_data.extend([midpoint] * frequencies[i])
-                    midpoints.append(midpoint)
-            
-            if not all_data:
-                print("⚠️ Нет данных для построения гистограммы")
+            # Средние точки интервалов, частоты передаются как веса
+            midpoints = [(start + end) / 2 for (start, end) in intervals[:len(frequencies)]]
+            
+            if not midpoints or sum(frequencies) == 0:
+                logger.warning("⚠️ Нет данных для построения гистограммы")
                 return
             
             # Гистограмма
-            ax.hist(all_data, bins=bins, edgecolor='black', alpha=0.7, 
-                   label=f'Частота (N={sum(frequencies)})', color='skyblue')
+            ax.hist(midpoints, bins=bins, weights=frequencies[:len(midpoints)], edgecolor='black', alpha=0.7, 
+                   label=f'Частота (N={sum(frequencies):g})', color='skyblue')
             
             # Добавляем медианы
             if hasattr(result, 'medians') and result.medians:
@@ -739,12 +881,122 @@ class StatisticsApp:
                    fontsize=10, verticalalignment='top',
                    bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
             
-            print("✅ Гистограмма построена")
+            logger.info("✅ Гистограмма построена")
+            
+        except Exception as e:
+            logger.exception(f"❌ Ошибка при построении гистограммы: {e}")
+    
+    def save_reference(self):
+        """Запоминает текущие данные как эталонную выборку для сравнения"""
+        if not self.data:
+            messagebox.showwarning("Нет данных", "Введите данные для анализа")
+            return
+        
+        self.reference_data = list(self.data)
+        self.update_status(f"Эталон: {len(self.reference_data)} чисел")
+        logger.info(f"📌 Эталон сохранен: {len(self.reference_data)} чисел")
+    
+    def compare_with_reference(self):
+        """Сравнивает текущие данные с эталоном на общей сетке интервалов"""
+        if not self.data or not self.reference_data:
+            messagebox.showwarning("Нет данных", 
+                                   "Нужны эталон ('Запомнить как эталон') и текущие данные")
+            return
+        
+        try:
+            comparison = compare_samples(self.data, self.reference_data)
+            
+            self.update_comparison_histogram(comparison)
+            self.update_status(f"✅ Сравнение: PSI = {comparison.psi:.4f}")
+            
+            messagebox.showinfo(
+                "Сравнение с эталоном",
+                f"📊 Интервалов: {len(comparison.intervals)}\n"
+                f"📐 Разница средних: {comparison.mean_diff:+.4f}\n"
+                f"📐 Разница σ: {comparison.std_diff:+.4f}\n"
+                f"📐 Разница асимметрии: {comparison.asymmetry_diff:+.4f}\n"
+                f"📐 Разница эксцесса: {comparison.excess_diff:+.4f}\n"
+                f"📈 KS: {comparison.ks_statistic:.4f} (p = {comparison.ks_p_value:.4g})\n"
+                f"📈 PSI: {comparison.psi:.4f}\n"
+                f"📈 KL: {comparison.kl_divergence:.4f}"
+            )
+            
+        except Exception as e:
+            messagebox.showerror("Ошибка сравнения", f"Ошибка: {str(e)}")
+            logger.error(f"❌ Ошибка сравнения: {e}")
+    
+    def export_results(self):
+        """Сохраняет таблицу интервалов и итоговые статистики (CSV, Parquet или Arrow)"""
+        if not self.current_result:
+            messagebox.showwarning("Нет результатов", "Сначала выполните расчет")
+            return
+        
+        path = filedialog.asksaveasfilename(
+            title="Экспорт результатов",
+            defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("Parquet", "*.parquet"), ("Arrow IPC", "*.arrow")]
+        )
+        if not path:
+            return
+        
+        # Итоговые статистики пишутся рядом: results.csv -> results_summary.csv
+        stem, ext = os.path.splitext(path)
+        summary_path = f"{stem}_summary{ext}"
+        
+        try:
+            self.current_result.export(path, table="intervals")
+            self.current_result.export(summary_path, table="summary")
+            
+            self.update_status(f"✅ Экспорт: {os.path.basename(path)}")
+            logger.info(f"💾 Результаты сохранены: {path}, {summary_path}")
+            
+        except Exception as e:
+            messagebox.showerror("Ошибка экспорта", f"Ошибка: {str(e)}")
+            logger.error(f"❌ Ошибка экспорта: {e}")
+    
+    def update_comparison_histogram(self, comparison):
+        """Строит наложенные гистограммы текущей и эталонной выборок"""
+        try:
+            for widget in self.plot_frame.winfo_children():
+                widget.destroy()
+            
+            intervals = comparison.intervals
+            if not intervals:
+                logger.warning("⚠️ Пустые данные для гистограммы")
+                return
+            
+            fig = Figure(figsize=(10, 5))
+            ax = fig.add_subplot(111)
+            
+            # Общая сетка, относительные частоты — выборки разного объема сравнимы
+            bins = [intervals[0][0]] + [upper for (_, upper) in intervals]
+            midpoints = [(start + end) / 2 for (start, end) in intervals]
+            
+            ax.hist(midpoints, bins=bins, weights=comparison.wi_reference, alpha=0.5,
+                   edgecolor='black', color='lightgray', label='Эталон')
+            ax.hist(midpoints, bins=bins, weights=comparison.wi_current, alpha=0.5,
+                   edgecolor='black', color='skyblue', label='Текущие данные')
+            
+            ax.set_xlabel('Значения')
+            ax.set_ylabel('Относительная частота')
+            ax.set_title('Сравнение распределений на общей сетке интервалов')
+            ax.legend()
+            ax.grid(True, alpha=0.3)
+            
+            stats_text = (f"Δx̄: {comparison.mean_diff:+.2f} | KS: {comparison.ks_statistic:.3f} | "
+                         f"PSI: {comparison.psi:.3f} | KL: {comparison.kl_divergence:.3f}")
+            ax.text(0.02, 0.98, stats_text, transform=ax.transAxes, 
+                   fontsize=10, verticalalignment='top',
+                   bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
+            
+            canvas = FigureCanvasTkAgg(fig, self.plot_frame)
+            canvas.draw()
+            canvas.get_tk_widget().pack(fill='both', expand=True)
+            
+            logger.info("✅ Гистограмма сравнения построена")
             
         except Exception as e:
-            print(f"❌ Ошибка при построении гистограммы: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"❌ Ошибка при построении гистограммы сравнения: {e}")
     
     def show_medians_modes(self):
         """Показывает медианы и моды (если есть результат)"""
@@ -856,11 +1108,66 @@ class StatisticsApp:
                          text=f"Среднее: {result.mean:.4f} | Стандартное отклонение: {result.std:.4f} | N: {len(self.data)}",
                          font=("Arial", 9, "italic")).pack()
             
-            print("✅ Окно медиан и мод открыто")
+            logger.info("✅ Окно медиан и мод открыто")
             
         except Exception as e:
             messagebox.showerror("Ошибка", f"Не удалось открыть медианы и моды: {str(e)}")
-            print(f"❌ Ошибка при открытии окна медиан и мод: {e}")
+            logger.error(f"❌ Ошибка при открытии окна медиан и мод: {e}")
+    
+    def show_bootstrap_intervals(self):
+        """Показывает бутстреп-доверительные интервалы основных статистик"""
+        if not self.data:
+            messagebox.showwarning("Нет данных", "Введите данные для анализа")
+            return
+        
+        try:
+            self.update_status("⏳ Бутстреп: 1000 выборок...")
+            self.root.update_idletasks()
+            boot = bootstrap_group_stats(self.data, n_resamples=1000, confidence=0.95, seed=0)
+            
+            ci_window = tk.Toplevel(self.root)
+            ci_window.title("Доверительные интервалы (бутстреп)")
+            ci_window.geometry("600x300")
+            
+            ci_tree = ttk.Treeview(ci_window, 
+                                  columns=('statistic', 'estimate', 'lower', 'upper'), 
+                                  show='headings', height=8)
+            
+            ci_tree.heading('statistic', text='Статистика')
+            ci_tree.heading('estimate', text='Оценка')
+            ci_tree.heading('lower', text='Нижняя граница')
+            ci_tree.heading('upper', text='Верхняя граница')
+            
+            for col in ('statistic', 'estimate', 'lower', 'upper'):
+                ci_tree.column(col, width=140, anchor='center')
+            
+            rows = [
+                ("Среднее (x̄)", boot.mean, boot.mean_ci),
+                ("Дисперсия (D)", boot.variance, boot.variance_ci),
+                ("Стандартное отклонение (σ)", boot.std, boot.std_ci),
+                ("Коэффициент вариации (V%)", boot.variation_coef, boot.variation_coef_ci),
+                ("Асимметрия (Ka)", boot.asymmetry, boot.asymmetry_ci),
+                ("Эксцесс (E)", boot.excess, boot.excess_ci),
+            ]
+            for name, estimate, (lower, upper) in rows:
+                ci_tree.insert('', 'end', 
+                              values=(name, f"{estimate:.4f}", f"{lower:.4f}", f"{upper:.4f}"))
+            
+            ci_tree.pack(fill='both', expand=True, padx=10, pady=10)
+            
+            ttk.Label(ci_window, 
+                     text=f"Уровень доверия: {boot.confidence:.0%} | Выборок: {boot.n_resamples} | seed: {boot.seed}",
+                     font=("Arial", 9, "italic")).pack()
+            
+            ttk.Button(ci_window, text="Закрыть", 
+                      command=ci_window.destroy).pack(pady=10)
+            
+            self.update_status(f"✅ Бутстреп: {boot.n_resamples} выборок")
+            logger.info("✅ Окно доверительных интервалов открыто")
+            
+        except Exception as e:
+            messagebox.showerror("Ошибка", f"Не удалось рассчитать доверительные интервалы: {str(e)}")
+            logger.error(f"❌ Ошибка бутстрепа: {e}")
     
     def generate_test_data(self):
         """Генерирует тестовые данные для проверки"""
@@ -885,10 +1192,14 @@ class StatisticsApp:
             f"📐 Стандартное отклонение: ~20"
         )
         
-        print(f"📊 Сгенерировано {len(self.data)} тестовых чисел")
+        logger.info(f"📊 Сгенерировано {len(self.data)} тестовых чисел")
 
 # Запуск приложения
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
     root = tk.Tk()
     app = StatisticsApp(root)
     root.mainloop()
\ No newline at end of file
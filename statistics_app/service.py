@@ -0,0 +1,421 @@
+"""Локальный HTTP/JSON сервис групповой статистики на базе rust_stats.
+
+Запуск:
+    python statistics_app/service.py --port 8765 --workers 4
+
+Эндпоинты:
+    GET  /health
+    POST /group_stats   {"data": [...], "weights": [...]}
+    POST /quantiles     {"data": [...], "probabilities": [0.25, 0.5, 0.75]}
+    POST /compare       {"current": [...], "reference": [...], "bins": 12}
+    POST /batch         {"jobs": [{"op": "group_stats", "data": [...]}, ...]}
+
+Большие выборки можно передавать бинарно: Content-Type
+application/octet-stream, тело — массив float64 в нативном порядке байт.
+Параметры тогда передаются в строке запроса: /quantiles?probabilities=0.1,0.9,
+/compare?split=N (первые N чисел — current, остальные — reference).
+
+Rust-функции отпускают GIL, поэтому расчеты выполняются в пуле потоков
+параллельно с обработкой соединений.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from rust_stats import group_stats, compare_samples
+
+logger = logging.getLogger("statistics_service")
+
+MAX_BODY_SIZE = 1 << 30
+DEFAULT_PROBABILITIES = (0.25, 0.5, 0.75)
+
+# Поля GroupStatsResult, возвращаемые в JSON
+RESULT_FIELDS = (
+    "intervals", "ni", "xi", "si", "xi_ni", "xi_minus_mean",
+    "abs_xi_minus_mean_ni", "squared_xi_minus_mean_ni",
+    "cubed_xi_minus_mean_ni", "fourth_power_xi_minus_mean_ni",
+    "sum_ni", "sum_xi_ni", "sum_abs", "sum_squared", "sum_cubed", "sum_fourth",
+    "mean", "variance", "std", "mean_linear_dev", "variation_coef",
+    "asymmetry", "excess", "medians", "modes",
+)
+
+COMPARISON_FIELDS = (
+    "intervals", "ni_current", "ni_reference", "wi_current", "wi_reference",
+    "mean_diff", "variance_diff", "std_diff", "mean_linear_dev_diff",
+    "variation_coef_diff", "asymmetry_diff", "excess_diff",
+    "ks_statistic", "ks_p_value", "psi", "kl_divergence",
+)
+
+# Обязательные поля каждой операции
+JOB_FIELDS = {
+    "group_stats": ("data",),
+    "quantiles": ("data",),
+    "compare": ("current", "reference"),
+}
+
+# Поля-выборки (списки чисел) и необязательные параметры с их типами
+SAMPLE_FIELDS = ("data", "weights", "current", "reference")
+NUMBER_LIST_FIELDS = ("probabilities",)
+INTEGER_FIELDS = ("bins",)
+
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found",
+                405: "Method Not Allowed", 413: "Payload Too Large",
+                500: "Internal Server Error"}
+
+
+class RequestError(Exception):
+    """Ошибка в запросе клиента (HTTP 4xx)"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def validate_job(op, params):
+    """Проверяет операцию и обязательные поля задания (HTTP 400 при ошибке)"""
+    if not isinstance(params, dict):
+        raise RequestError("job must be a JSON object")
+    if op not in JOB_FIELDS:
+        raise RequestError(f"unknown operation '{op}', expected one of: {', '.join(JOB_FIELDS)}")
+    missing = [name for name in JOB_FIELDS[op] if name not in params]
+    if missing:
+        raise RequestError(f"missing field(s): {', '.join(missing)}")
+    # Элементы выборок проверяет rust_stats (TypeError -> 400), здесь — только
+    # сами поля и короткие параметры
+    for name in SAMPLE_FIELDS:
+        value = params.get(name)
+        if (value is not None or name in JOB_FIELDS[op]) and not isinstance(value, list):
+            raise RequestError(f"field '{name}' must be a list of numbers")
+    for name in NUMBER_LIST_FIELDS:
+        value = params.get(name)
+        if value is not None and not (isinstance(value, list) and all(is_number(x) for x in value)):
+            raise RequestError(f"field '{name}' must be a list of numbers")
+    for name in INTEGER_FIELDS:
+        value = params.get(name)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, int)):
+            raise RequestError(f"field '{name}' must be an integer")
+
+
+def is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def json_safe(value):
+    """Заменяет NaN и бесконечности на None: в JSON их нет"""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [json_safe(item) for item in value]
+    return value
+
+
+def result_to_dict(result):
+    """Преобразует GroupStatsResult в словарь для JSON"""
+    return {field: getattr(result, field) for field in RESULT_FIELDS}
+
+
+def grouped_quantiles(result, probabilities):
+    """Квантили по интервалам — та же интерполяция, что и для медианы"""
+    intervals, ni, si = result.intervals, result.ni, result.si
+    total_n = result.sum_ni
+    quantiles = []
+    for p in probabilities:
+        if not 0.0 <= p <= 1.0:
+            raise RequestError(f"probability {p} is outside [0, 1]")
+        if total_n == 0:
+            quantiles.append(None)
+            continue
+        target = p * total_n
+        # Первый интервал, в котором накопленная частота достигает p·N
+        i = next((j for j, s in enumerate(si) if s >= target and ni[j] > 0), len(si) - 1)
+        lower, upper = intervals[i]
+        accum_before = si[i - 1] if i > 0 else 0.0
+        quantiles.append(lower + (target - accum_before) / ni[i] * (upper - lower))
+    return quantiles
+
+
+def comparison_to_dict(comparison):
+    """Преобразует ComparisonResult в словарь для JSON"""
+    payload = {field: getattr(comparison, field) for field in COMPARISON_FIELDS}
+    payload["current"] = result_to_dict(comparison.current)
+    payload["reference"] = result_to_dict(comparison.reference)
+    return payload
+
+
+def run_job(op, params):
+    """Выполняется в потоке пула: вызывает Rust и собирает JSON-ответ"""
+    if op == "group_stats":
+        return result_to_dict(group_stats(params["data"], weights=params.get("weights")))
+    if op == "quantiles":
+        result = group_stats(params["data"])
+        probabilities = params.get("probabilities") or DEFAULT_PROBABILITIES
+        return {
+            "probabilities": list(probabilities),
+            "quantiles": grouped_quantiles(result, probabilities),
+            "intervals": result.intervals,
+        }
+    if op == "compare":
+        comparison = compare_samples(params["current"], params["reference"],
+                                     bins=params.get("bins"), n_threads=1)
+        return comparison_to_dict(comparison)
+    raise RequestError(f"unknown operation '{op}'", status=404)
+
+
+class ResultCache:
+    """LRU-кэш результатов, общий для всех соединений.
+
+    Одинаковые запросы, пришедшие одновременно, ждут один и тот же расчет.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.in_flight = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def get_or_compute(self, key, compute):
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+        if key in self.in_flight:
+            self.hits += 1
+            return await asyncio.shield(self.in_flight[key])
+
+        self.misses += 1
+        future = asyncio.ensure_future(compute())
+        self.in_flight[key] = future
+        try:
+            value = await asyncio.shield(future)
+        finally:
+            self.in_flight.pop(key, None)
+
+        if self.max_entries > 0:
+            self.entries[key] = value
+            if len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return value
+
+
+def cache_key(op, params, body):
+    """Ключ кэша: операция, параметры и сырое тело запроса"""
+    digest = hashlib.sha256(op.encode())
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode())
+    digest.update(body)
+    return digest.hexdigest()
+
+
+def parse_float_list(text):
+    return [float(x) for x in text.split(",") if x]
+
+
+class StatisticsService:
+    """HTTP/1.1 сервер на asyncio с пулом потоков для расчетов"""
+
+    def __init__(self, workers=None, cache_size=256):
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = ThreadPoolExecutor(max_workers=self.workers,
+                                           thread_name_prefix="stats-worker")
+        self.cache = ResultCache(cache_size)
+        self.requests_served = 0
+
+    async def compute(self, op, params, body=b""):
+        """Расчет через кэш и пул потоков"""
+        key = cache_key(op, {k: v for k, v in params.items() if k not in ("data", "current", "reference")}, body)
+        loop = asyncio.get_running_loop()
+        return await self.cache.get_or_compute(
+            key, lambda: loop.run_in_executor(self.executor, run_job, op, params)
+        )
+
+    async def decode_json(self, body):
+        """Разбирает JSON в пуле потоков: тело до MAX_BODY_SIZE не блокирует цикл событий"""
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self.executor, json.loads, body or b"{}")
+        except json.JSONDecodeError as e:
+            raise RequestError(f"invalid JSON: {e}")
+
+    async def parse_job(self, op, query, content_type, body):
+        """Извлекает параметры операции из JSON или бинарного тела"""
+        if content_type.startswith("application/octet-stream"):
+            if len(body) % 8:
+                raise RequestError("binary body must be a whole number of float64 values")
+            values = memoryview(body).cast("d")
+            params = {}
+            if op == "compare":
+                if "split" not in query:
+                    raise RequestError("binary /compare needs ?split=N")
+                split = int(query["split"][0])
+                if not 0 <= split <= len(values):
+                    raise RequestError("split is outside the payload")
+                params["current"] = values[:split]
+                params["reference"] = values[split:]
+                # split входит в ключ кэша: то же тело с другим split — другой запрос
+                params["split"] = split
+            else:
+                params["data"] = values
+            if "probabilities" in query:
+                params["probabilities"] = parse_float_list(query["probabilities"][0])
+            if "bins" in query:
+                params["bins"] = int(query["bins"][0])
+            return params, body
+
+        params = await self.decode_json(body)
+        validate_job(op, params)
+        return params, body
+
+    async def dispatch(self, method, path, query, content_type, body):
+        """Маршрутизация запроса; возвращает (статус, объект для JSON)"""
+        if path == "/health":
+            return 200, {
+                "status": "ok",
+                "workers": self.workers,
+                "requests_served": self.requests_served,
+                "cache_entries": len(self.cache.entries),
+                "cache_hits": self.cache.hits,
+                "cache_misses": self.cache.misses,
+            }
+
+        op = path.strip("/")
+        if op not in ("group_stats", "quantiles", "compare", "batch"):
+            raise RequestError(f"unknown path '{path}'", status=404)
+        if method != "POST":
+            raise RequestError("use POST", status=405)
+
+        if op == "batch":
+            # Несколько заданий одним запросом, каждое проходит через кэш и пул
+            request = await self.decode_json(body)
+            jobs = request.get("jobs", []) if isinstance(request, dict) else None
+            if not isinstance(jobs, list):
+                raise RequestError("batch body must be {\"jobs\": [...]}")
+            # Все задания проверяются до запуска, ошибка в одном — 400 для всего пакета
+            for i, job in enumerate(jobs):
+                try:
+                    validate_job(job.get("op") if isinstance(job, dict) else None, job)
+                except RequestError as e:
+                    raise RequestError(f"job {i}: {e}")
+            # Сериализация заданий для ключей кэша тоже не выполняется в цикле событий
+            loop = asyncio.get_running_loop()
+            raw_jobs = await loop.run_in_executor(
+                self.executor, lambda: [json.dumps(job, sort_keys=True).encode() for job in jobs]
+            )
+            results = await asyncio.gather(*[
+                self.compute(job.get("op", ""), job, raw)
+                for job, raw in zip(jobs, raw_jobs)
+            ])
+            return 200, {"results": results}
+
+        params, raw = await self.parse_job(op, query, content_type, body)
+        return 200, await self.compute(op, params, raw)
+
+    async def handle_connection(self, reader, writer):
+        """Обслуживает одно соединение (с поддержкой keep-alive)"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self.write_response(writer, 400, {"error": "malformed request line"}, False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = (version == "HTTP/1.1" and headers.get("connection", "").lower() != "close")
+                try:
+                    length = int(headers.get("content-length", 0) or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    # Без корректной длины тело не отделить от следующего запроса
+                    await self.write_response(writer, 400, {"error": "invalid Content-Length"}, False)
+                    break
+                if length > MAX_BODY_SIZE:
+                    await self.write_response(writer, 413, {"error": "payload too large"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                url = urlsplit(target)
+                try:
+                    status, payload = await self.dispatch(
+                        method, url.path, parse_qs(url.query),
+                        headers.get("content-type", "application/json"), body
+                    )
+                except RequestError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except (ValueError, TypeError) as e:
+                    # Ошибки проверки входных данных из rust_stats: TypeError —
+                    # значение, которое pyo3 не смог преобразовать в число
+                    status, payload = 400, {"error": str(e)}
+                except Exception as e:
+                    logger.exception(f"❌ Ошибка обработки {method} {target}")
+                    status, payload = 500, {"error": str(e)}
+
+                self.requests_served += 1
+                await self.write_response(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def write_response(self, writer, status, payload, keep_alive):
+        body = json.dumps(json_safe(payload), allow_nan=False).encode()
+        head = (
+            f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        ).encode("latin-1")
+        writer.write(head + body)
+        await writer.drain()
+
+    async def serve(self, host, port):
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        logger.info(f"✅ Сервис статистики: http://{host}:{port} (потоков: {self.workers})")
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Локальный HTTP/JSON сервис групповой статистики")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="размер пула потоков (по умолчанию — число CPU)")
+    parser.add_argument("--cache-size", type=int, default=256,
+                        help="число результатов в кэше (0 — без кэша)")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+    service = StatisticsService(workers=args.workers, cache_size=args.cache_size)
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        logger.info("Сервис остановлен")
+
+
+if __name__ == "__main__":
+    main()